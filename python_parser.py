@@ -4,6 +4,9 @@ import json
 import sys
 import os
 
+# Kinds whose entity IDs include the line number, since their names collide within the same file scope
+LINE_QUALIFIED_KINDS = frozenset(['pythonvariable', 'pythonparameter'])
+
 # --- Node Visitor ---
 class PythonAstVisitor(ast.NodeVisitor):
     def __init__(self, filepath):
@@ -15,6 +18,7 @@ class PythonAstVisitor(ast.NodeVisitor):
         self.current_class_entity_id = None
         self.current_func_entity_id = None # Can be function or method
         self.module_entity_id = None # Store the module/file entity id
+        self._entity_id_prefixes = {} # kind -> (prefix "kind:filepath:", line qualified?), built once per kind
 
     def _get_location(self, node):
         # ast line numbers are 1-based, columns are 0-based
@@ -36,13 +40,17 @@ class PythonAstVisitor(ast.NodeVisitor):
 
     def _generate_entity_id(self, kind, qualified_name, line_number=None):
         # Simple entity ID generation - can be refined
-        # Use lowercase kind for consistency
+        # Use lowercase kind for consistency; the "kind:filepath:" prefix is the same for every ID of a kind
+        cached = self._entity_id_prefixes.get(kind)
+        if cached is None:
+            lower_kind = kind.lower()
+            cached = (f"{lower_kind}:{self.filepath}:", lower_kind in LINE_QUALIFIED_KINDS)
+            self._entity_id_prefixes[kind] = cached
+        prefix, line_qualified = cached
         # Include line number for kinds prone to name collision within the same file scope
-        if kind.lower() in ['pythonvariable', 'pythonparameter'] and line_number is not None:
-            unique_qualifier = f"{qualified_name}:{line_number}"
-        else:
-            unique_qualifier = qualified_name
-        return f"{kind.lower()}:{self.filepath}:{unique_qualifier}" # Added closing brace
+        if line_qualified and line_number is not None:
+            return f"{prefix}{qualified_name}:{line_number}"
+        return prefix + qualified_name
 
     def _add_node(self, kind, name, node, parent_id=None, extra_props=None):
          location = self._get_location(node)
@@ -231,7 +239,8 @@ if __name__ == "__main__":
             "nodes": visitor.nodes,
             "relationships": visitor.relationships
         }
-        print(json.dumps(result, indent=2)) # Output JSON to stdout
+        # Output compact JSON to stdout; it is only read by PythonAstParser, so indentation would just inflate the pipe
+        print(json.dumps(result, separators=(',', ':')))
 
     except Exception as e:
         # Use the normalized, absolute path in the error message
@@ -149,7 +149,9 @@ export function getTargetDeclarationInfo(
 
         // If no specific kind was determined, try a fallback or return null
         if (kind === 'unknown') {
-             logger.debug(`[getTargetDeclarationInfo] Could not determine specific target kind for node: ${expression.getText()}`);
+             if (logger.isDebugEnabled()) { // getText() slices the source, so only pay for it when the line is logged
+                 logger.debug(`[getTargetDeclarationInfo] Could not determine specific target kind for node: ${expression.getText()}`);
+             }
             // Maybe try symbol flags? e.g., symbol.getFlags() & ts.SymbolFlags.Function
             return null;
         }
@@ -14,7 +14,7 @@ const { SyntaxKind: SK } = ts;
  * @param context - The parser context.
  */
 export function analyzeAssignments(body: Node, parentNode: AstNode, context: ParserContext): void {
-    const { addRelationship, generateId, generateEntityId, logger, now, result } = context;
+    const { addRelationship, generateId, generateEntityId, logger, now } = context;
 
     try {
         // Find BinaryExpressions with an assignment operator (=)
@@ -49,7 +49,8 @@ export function analyzeAssignments(body: Node, parentNode: AstNode, context: Par
 
             if (targetInfo) {
                 // Check if the resolved target is within the current file
-                targetNodeInFile = result.nodes.find(n => n.entityId === targetInfo.entityId && n.filePath === parentNode.filePath);
+                const candidate = context.nodesById.get(targetInfo.entityId);
+                targetNodeInFile = candidate?.filePath === parentNode.filePath ? candidate : undefined;
                 if (targetNodeInFile) {
                     // Only consider mutations to Variables or Properties (represented as Variables for now)
                     if (targetInfo.kind === 'Variable' || targetInfo.kind === 'Parameter') { // Allow mutating params? Maybe not ideal. Let's stick to Variable for now.
@@ -69,7 +70,9 @@ export function analyzeAssignments(body: Node, parentNode: AstNode, context: Par
                     continue; // Skip cross-file in Pass 1
                 }
             } else {
-                logger.debug(`[Pass 1] Could not resolve MUTATES_STATE target: ${leftHandSide.getText()} in ${parentNode.name}. Deferring to Pass 2.`);
+                if (logger.isDebugEnabled()) { // getText() slices the source, so only pay for it when the line is logged
+                    logger.debug(`[Pass 1] Could not resolve MUTATES_STATE target: ${leftHandSide.getText()} in ${parentNode.name}. Deferring to Pass 2.`);
+                }
                 continue; // Skip unresolved in Pass 1
             }
 
@@ -13,7 +13,7 @@ const { SyntaxKind: SK } = ts;
  * @param context - The parser context.
  */
 export function analyzeCalls(body: Node, parentNode: AstNode, context: ParserContext): void {
-    const { addRelationship, generateId, generateEntityId, logger, now, result } = context;
+    const { addRelationship, generateId, generateEntityId, logger, now } = context;
 
     try {
         const callExpressions = body.getDescendantsOfKind(SK.CallExpression);
@@ -49,7 +49,8 @@ export function analyzeCalls(body: Node, parentNode: AstNode, context: ParserCon
 
             if (targetInfo) {
                 // Check if the resolved target is within the current file being parsed
-                targetNodeInFile = result.nodes.find(n => n.entityId === targetInfo.entityId && n.filePath === parentNode.filePath);
+                const candidate = context.nodesById.get(targetInfo.entityId);
+                targetNodeInFile = candidate?.filePath === parentNode.filePath ? candidate : undefined;
                 if (targetNodeInFile) {
                     targetEntityId = targetInfo.entityId;
                     logger.debug(`[Pass 1] Intra-file CALL detected: ${parentNode.name} -> ${targetInfo.name}`);
@@ -60,7 +61,9 @@ export function analyzeCalls(body: Node, parentNode: AstNode, context: ParserCon
                 }
             } else {
                 // Cannot resolve target, skip in Pass 1
-                logger.debug(`[Pass 1] Could not resolve CALL target: ${expression.getText()} in ${parentNode.name}. Deferring to Pass 2.`);
+                if (logger.isDebugEnabled()) { // getText() slices the source, so only pay for it when the line is logged
+                    logger.debug(`[Pass 1] Could not resolve CALL target: ${expression.getText()} in ${parentNode.name}. Deferring to Pass 2.`);
+                }
                 continue;
             }
 
@@ -9,6 +9,7 @@ import { createContextLogger } from '../utils/logger.js';
 import config from '../config/index.js';
 import { Project } from 'ts-morph';
 import { Neo4jClient } from '../database/neo4j-client.js';
+import { SchemaManager } from '../database/schema.js';
 import { Neo4jError } from '../utils/errors.js';
 // Removed setTimeout import
 
@@ -21,11 +22,18 @@ export class AnalyzerService {
     private parser: Parser;
     private storageManager: StorageManager;
     private neo4jClient: Neo4jClient;
+    private ownsNeo4jClient: boolean; // Only a client created here is closed here
 
-    constructor() {
+    /**
+     * Creates an AnalyzerService.
+     * @param neo4jClient - Optional already-configured client (e.g. from the CLI) whose driver and pool are reused.
+     *                      If omitted, a client using config defaults is created and closed after analysis.
+     */
+    constructor(neo4jClient?: Neo4jClient) {
         this.parser = new Parser();
+        this.ownsNeo4jClient = !neo4jClient;
         // Instantiate Neo4jClient without overrides to use config defaults
-        this.neo4jClient = new Neo4jClient();
+        this.neo4jClient = neo4jClient ?? new Neo4jClient();
         // Pass the client instance to StorageManager
         this.storageManager = new StorageManager(this.neo4jClient);
         logger.info('AnalyzerService initialized.');
@@ -35,8 +43,12 @@ export class AnalyzerService {
      * Runs the full analysis pipeline for a given directory.
      * Assumes database is cleared externally (e.g., via test setup).
      * @param directory - The root directory to analyze.
+     * @param databaseReady - Optional pending database preparation (e.g. reset and schema setup) that must finish
+     *                        before anything is stored; scanning and parsing proceed while it runs.
+     *                        It must include applySchema. If omitted, only the CodeNode entityId constraint that
+     *                        node and endpoint MERGEs rely on is ensured before storing.
      */
-    async analyze(directory: string): Promise<void> {
+    async analyze(directory: string, databaseReady?: Promise<void>): Promise<void> {
         logger.info(`Starting analysis for directory: ${directory}`);
         const absoluteDirectory = path.resolve(directory);
         let scanner: FileScanner;
@@ -69,61 +81,70 @@ export class AnalyzerService {
                 return;
             }
 
-            // 4. Resolve Relationships (Pass 2)
+            // 4. Store Nodes
+            logger.info('Storing nodes...');
+            // Ensure driver is initialized before storing
+            await this.neo4jClient.initializeDriver('AnalyzerService-Store');
+            if (databaseReady) {
+                await databaseReady;
+            } else {
+                // Without it, concurrent writers could create duplicate nodes for the same entityId
+                await new SchemaManager(this.neo4jClient).ensureBaseLabelConstraint();
+            }
+
+            // --- Database clearing is now handled by beforeEach in tests ---
+
+            const finalNodes = pass1Nodes;
+            const nodeCounters = await this.storageManager.saveNodesBatch(finalNodes);
+
+            // 5. Resolve Relationships (Pass 2)
             logger.info('Resolving relationships (Pass 2)...');
             const tsProject: Project = this.parser.getTsProject();
             const resolver = new RelationshipResolver(pass1Nodes, pass1Relationships);
             const pass2Relationships = await resolver.resolveRelationships(tsProject);
             logger.info(`Resolved ${pass2Relationships.length} relationships in Pass 2.`);
 
-            const finalNodes = pass1Nodes;
-            const finalRelationships = [...pass1Relationships, ...pass2Relationships];
-            const uniqueRelationships = Array.from(new Map(finalRelationships.map(r => [r.entityId, r])).values());
-            logger.info(`Total unique relationships after combining passes: ${uniqueRelationships.length}`);
-
-            // 5. Store Results
-            logger.info('Storing analysis results...');
-            // Ensure driver is initialized before storing
-            await this.neo4jClient.initializeDriver('AnalyzerService-Store');
-
-            // --- Database clearing is now handled by beforeEach in tests ---
+            // Deduplicate by entityId (last write wins) without materialising the combined array or [key, value] pairs
+            const relationshipsById = new Map<string, RelationshipInfo>();
+            for (const rel of pass1Relationships) {
+                relationshipsById.set(rel.entityId, rel);
+            }
+            for (const rel of pass2Relationships) {
+                relationshipsById.set(rel.entityId, rel);
+            }
+            logger.info(`Total unique relationships after combining passes: ${relationshipsById.size}`);
 
-            await this.storageManager.saveNodesBatch(finalNodes);
+            // 6. Store Relationships
+            logger.info('Storing relationships...');
 
             // Group relationships by type before saving
-            const relationshipsByType: { [type: string]: RelationshipInfo[] } = {};
-            for (const rel of uniqueRelationships) {
-                if (!relationshipsByType[rel.type]) {
-                    relationshipsByType[rel.type] = [];
+            const relationshipsByType = new Map<string, RelationshipInfo[]>();
+            for (const rel of relationshipsById.values()) {
+                let batch = relationshipsByType.get(rel.type);
+                if (!batch) {
+                    batch = [];
+                    relationshipsByType.set(rel.type, batch);
                 }
-                // Push directly, using non-null assertion to satisfy compiler
-                relationshipsByType[rel.type]!.push(rel);
+                batch.push(rel);
             }
 
-            // Save relationships batch by type
-            for (const type in relationshipsByType) {
-                 const batch = relationshipsByType[type];
-                 // --- TEMPORARY DEBUG LOG ---
-                 logger.debug(`[AnalyzerService] Processing relationship type: ${type}, Batch size: ${batch?.length ?? 0}`);
-                 if (type === 'HAS_METHOD') {
-                     logger.debug(`[AnalyzerService] Found HAS_METHOD batch. Calling saveRelationshipsBatch...`);
-                 }
-                 // --- END TEMPORARY DEBUG LOG ---
-                 // Ensure batch is not undefined before passing (still good practice)
-                 if (batch) {
-                    await this.storageManager.saveRelationshipsBatch(type, batch);
-                 }
-            }
+            // Batches of all types are written concurrently (bounded by config.storageConcurrency)
+            const relationshipCounters = await this.storageManager.saveRelationshipsByType(relationshipsByType);
 
-            logger.info('Analysis results stored successfully.');
+            // Report what the server actually changed, per step, rather than the input sizes
+            logger.info('Analysis results stored successfully.', {
+                counters: { nodes: nodeCounters, relationships: relationshipCounters },
+            });
 
         } catch (error: any) {
             logger.error(`Analysis failed: ${error.message}`, { stack: error.stack });
             throw error; // Re-throw the error for higher-level handling
         } finally {
-            // 6. Cleanup & Disconnect
-            logger.info('Closing Neo4j driver...');
-            await this.neo4jClient.closeDriver('AnalyzerService-Cleanup');
+            // 7. Cleanup & Disconnect
+            if (this.ownsNeo4jClient) {
+                logger.info('Closing Neo4j driver...');
+                await this.neo4jClient.closeDriver('AnalyzerService-Cleanup');
+            }
             logger.info('Analysis complete.');
         }
     }
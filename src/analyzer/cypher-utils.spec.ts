@@ -0,0 +1,42 @@
+import { describe, it, expect } from 'vitest';
+import { compactCypher, escapeCypherIdentifier, generateStaleLabelRemoveClause } from './cypher-utils.js';
+
+describe('compactCypher', () => {
+    it('should join indented lines with single spaces', () => {
+        const cypher = `
+            UNWIND $batch AS row
+            MERGE (n:CodeNode { entityId: row.entityId })
+        `;
+        expect(compactCypher(cypher)).toBe('UNWIND $batch AS row MERGE (n:CodeNode { entityId: row.entityId })');
+    });
+
+    it('should keep spacing within a line unchanged', () => {
+        expect(compactCypher("RETURN 'a  b'")).toBe("RETURN 'a  b'");
+    });
+});
+
+describe('escapeCypherIdentifier', () => {
+    it('should return simple identifiers unchanged', () => {
+        expect(escapeCypherIdentifier('CALLS')).toBe('CALLS');
+        expect(escapeCypherIdentifier('_private_Type1')).toBe('_private_Type1');
+    });
+
+    it('should backtick-quote identifiers that need it', () => {
+        expect(escapeCypherIdentifier('HAS-PROP')).toBe('`HAS-PROP`');
+        expect(escapeCypherIdentifier('1ST')).toBe('`1ST`');
+        expect(escapeCypherIdentifier('a`b')).toBe('`a``b`');
+    });
+
+    it('should reject empty names', () => {
+        expect(() => escapeCypherIdentifier('')).toThrow('Invalid Cypher label or relationship type');
+    });
+});
+
+describe('generateStaleLabelRemoveClause', () => {
+    it('should remove every kind label except the kept one', () => {
+        const clause = generateStaleLabelRemoveClause('Class');
+        expect(clause.startsWith('REMOVE n:`File`:`Directory`:')).toBe(true);
+        expect(clause).toContain('`Interface`');
+        expect(clause).not.toContain('`Class`');
+    });
+});
@@ -1,26 +1,55 @@
 // src/analyzer/cypher-utils.ts
 import { NODE_LABELS } from '../database/schema.js'; // Import labels from schema
+import { InternalError } from '../utils/errors.js';
+
+// Plain identifiers need no quoting; anything else is backtick-quoted
+const SIMPLE_IDENTIFIER_RE = /^[A-Za-z_][A-Za-z0-9_]*$/;
+const escapedIdentifierCache = new Map<string, string>();
 
 /**
- * Generates the Cypher clauses for removing old labels and setting the correct new label
- * based on the 'kind' property during a node MERGE operation.
+ * Generates a REMOVE clause for the kind labels in NODE_LABELS, so a node whose kind changed since an earlier run
+ * doesn't keep its old kind label. Expects the query to bind the node as `n`.
  *
- * @returns An object containing the removeClause and setLabelClauses.
+ * @param keepLabel - The node's current kind label, left out of the clause so it isn't removed and re-added.
+ * @returns The REMOVE clause.
  */
-export function generateNodeLabelCypher(): { removeClause: string; setLabelClauses: string } {
-    // Use the imported NODE_LABELS
-    const allLabels = NODE_LABELS;
-    const removeClause = allLabels.map((label: string) => `\`${label}\``).join(':'); // Generates `:File:Directory:...`
+export function generateStaleLabelRemoveClause(keepLabel?: string): string {
+    const staleLabels = NODE_LABELS.filter((label: string) => label !== keepLabel);
+    return `REMOVE n:${staleLabels.map((label: string) => `\`${label}\``).join(':')}`;
+}
 
-    // Generate the FOREACH clauses dynamically based on NODE_LABELS
-    const setLabelClauses = allLabels.map((label: string) =>
-        `FOREACH (_ IN CASE kind WHEN '${label}' THEN [1] ELSE [] END | SET n:\`${label}\`)`
-    ).join('\n                '); // Indentation for readability in the final query
+/**
+ * Collapses the line breaks and indentation of a multi-line query template into single spaces.
+ * The query text is sent with every RUN and keys the server's plan cache, so cached queries are compacted once
+ * instead of shipping their source-code indentation with each batch.
+ * Line comments (`// ...`) must not be used in queries passed here, since they would swallow the following lines.
+ *
+ * @param cypher - The query template.
+ * @returns The query on a single line.
+ */
+export function compactCypher(cypher: string): string {
+    return cypher.replace(/\s*\n\s*/g, ' ').trim();
+}
 
-    return {
-        removeClause: `REMOVE n:${removeClause}`,
-        setLabelClauses: setLabelClauses
-    };
+/**
+ * Escapes a label or relationship type for interpolation into Cypher.
+ * Simple identifiers are returned unchanged; others are backtick-quoted with embedded backticks doubled.
+ * Results are cached, since the same small vocabulary of types is escaped for every batch.
+ *
+ * @param name - The label or relationship type.
+ * @returns The identifier, safe to use as `:${escaped}` in a query.
+ * @throws {InternalError} If the name is empty or contains a NUL character (not valid in Cypher identifiers).
+ */
+export function escapeCypherIdentifier(name: string): string {
+    let escaped = escapedIdentifierCache.get(name);
+    if (escaped === undefined) {
+        if (!name || name.includes('\u0000')) {
+            throw new InternalError(`Invalid Cypher label or relationship type: ${JSON.stringify(name)}`);
+        }
+        escaped = SIMPLE_IDENTIFIER_RE.test(name) ? name : `\`${name.replace(/`/g, '``')}\``;
+        escapedIdentifierCache.set(name, escaped);
+    }
+    return escaped;
 }
 
 // Add other Cypher generation utilities here if needed in the future
\ No newline at end of file
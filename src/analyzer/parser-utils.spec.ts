@@ -0,0 +1,20 @@
+import { describe, it, expect } from 'vitest';
+import { generateEntityId, generateInstanceId } from './parser-utils.js';
+
+describe('generateEntityId', () => {
+    it('should return already normalized identifiers unchanged', () => {
+        expect(generateEntityId('function', '/src/app.ts:main')).toBe('function:/src/app.ts:main');
+    });
+
+    it('should normalize slashes, case and other characters', () => {
+        expect(generateEntityId('Class', 'C:\\Src\\App.ts:My Class')).toBe('class:c:/src/app.ts:my_class');
+    });
+});
+
+describe('generateInstanceId', () => {
+    it('should keep case and sanitize other characters', () => {
+        const counter = { count: 0 };
+        expect(generateInstanceId(counter, 'calls', 'a\\B c', { line: 3 })).toBe('calls:a/B_c:L3:1');
+        expect(generateInstanceId(counter, 'calls', 'Simple.name')).toBe('calls:Simple.name:2');
+    });
+});
@@ -8,15 +8,29 @@ import config from '../config/index.js'; // Import config for TEMP_DIR
 
 const TEMP_DIR = config.tempDir; // Use tempDir from config
 
+// Identifiers that already consist only of the allowed characters pass through the ID helpers unchanged,
+// so the common case is one anchored test instead of a chain of replace()/toLowerCase() copies
+const SAFE_ENTITY_IDENTIFIER_RE = /^[a-z0-9_.:/-]*$/;
+const SAFE_INSTANCE_IDENTIFIER_RE = /^[a-zA-Z0-9_.:/-]*$/;
+
+// Shared by every parseFile call, so the directory is created once per process instead of once per file
+let tempDirReady: Promise<void> | null = null;
+
 /**
  * Ensures the temporary directory for intermediate results exists.
+ * The mkdir runs once and later calls await the same promise; a failed attempt is retried on the next call.
  */
-export async function ensureTempDir(): Promise<void> {
-    try {
-        await fsPromises.mkdir(TEMP_DIR, { recursive: true });
-    } catch (error: any) {
-        throw new FileSystemError(`Failed to create temporary directory: ${TEMP_DIR}`, { originalError: error });
+export function ensureTempDir(): Promise<void> {
+    if (!tempDirReady) {
+        tempDirReady = fsPromises.mkdir(TEMP_DIR, { recursive: true }).then(
+            () => undefined,
+            (error: any) => {
+                tempDirReady = null;
+                throw new FileSystemError(`Failed to create temporary directory: ${TEMP_DIR}`, { originalError: error });
+            }
+        );
     }
+    return tempDirReady;
 }
 
 /**
@@ -96,8 +110,8 @@ export function generateEntityId(prefix: string, qualifiedName: string): string
         // Potentially throw an error or return a placeholder
         return `${prefix || 'unknown'}:${qualifiedName || 'unknown'}:${Date.now()}`; // Add timestamp for some uniqueness
     }
-    // Normalize path separators, convert to lowercase, and sanitize characters
-    const safeIdentifier = qualifiedName
+    // Normalize path separators, convert to lowercase, and sanitize characters (skipped when already normalized)
+    const safeIdentifier = SAFE_ENTITY_IDENTIFIER_RE.test(qualifiedName) ? qualifiedName : qualifiedName
         .replace(/\\/g, '/') // Normalize slashes FIRST
         .toLowerCase()       // Convert to lowercase for case-insensitivity
         .replace(/[^a-z0-9_.:/-]/g, '_'); // Allow specific chars (adjusted for lowercase), replace others
@@ -122,7 +136,7 @@ export function generateInstanceId(
      if (!prefix || !identifier) {
         console.warn(`generateInstanceId called with empty prefix or identifier. Prefix: ${prefix}, ID: ${identifier}`);
      }
-    const safeIdentifier = identifier
+    const safeIdentifier = SAFE_INSTANCE_IDENTIFIER_RE.test(identifier) ? identifier : identifier
         .replace(/\\/g, '/')
         .replace(/[^a-zA-Z0-9_.:/-]/g, '_');
 
@@ -10,6 +10,7 @@ import { CCppParser } from './parsers/c-cpp-parser.js';
 import { JavaParser } from './parsers/java-parser.js';
 import { GoParser } from './parsers/go-parser.js';
 import { CSharpParser } from './parsers/csharp-parser.js';
+import { runWithConcurrency } from '../utils/concurrency.js';
 // import { SqlParser } from './parsers/sql-parser.js'; // Temporarily disabled
 // Import individual TS parsers
 import { parseFunctions } from './parsers/function-parser.js';
@@ -67,36 +68,37 @@ export class Parser {
      */
     async parseFiles(files: FileInfo[]): Promise<void> {
         logger.info(`Starting Pass 1 processing for ${files.length} files...`);
-        const parsePromises: Promise<string | null>[] = [];
-        // Store normalized paths of all files passed to this specific run
-        const targetFilePaths = new Set(files.map(f => path.resolve(f.path).replace(/\\/g, '/')));
+        const parseTasks: (() => Promise<string | null>)[] = [];
+        // Normalized paths of all files passed to this specific run, collected in the dispatch loop below
+        const targetFilePaths = new Set<string>();
 
         const tsFilesToAdd: string[] = [];
 
         for (const file of files) {
-            let parsePromise: Promise<string | null> | null = null;
+            targetFilePaths.add(path.resolve(file.path).replace(/\\/g, '/'));
+            let parseTask: (() => Promise<string | null>) | null = null;
             try {
                 switch (file.extension) {
                     case '.py':
-                        parsePromise = this.pythonParser.parseFile(file);
+                        parseTask = () => this.pythonParser.parseFile(file);
                         break;
                     case '.c':
                     case '.cpp':
                     case '.h':
                     case '.hpp':
-                        parsePromise = this.cppParser.parseFile(file);
+                        parseTask = () => this.cppParser.parseFile(file);
                         break;
                     case '.java':
-                        parsePromise = this.javaParser.parseFile(file);
+                        parseTask = () => this.javaParser.parseFile(file);
                         break;
                     case '.go':
-                        parsePromise = this.goParser.parseFile(file);
+                        parseTask = () => this.goParser.parseFile(file);
                         break;
                     case '.cs':
-                        parsePromise = this.csharpParser.parseFile(file);
+                        parseTask = () => this.csharpParser.parseFile(file);
                         break;
                     // case '.sql': // Temporarily disabled
-                    //     parsePromise = this.sqlParser.parseFile(file);
+                    //     parseTask = () => this.sqlParser.parseFile(file);
                     //     break;
                     case '.ts':
                     case '.tsx':
@@ -106,8 +108,7 @@ export class Parser {
                     case '.cjs':
                         // Add TS/JS files to the project instead of calling a separate parser
                         logger.debug(`Adding TS/JS file to project: ${file.path}`);
-                        tsFilesToAdd.push(file.path);
-                        parsePromise = Promise.resolve(null); // No JSON file generated for TS/JS in Pass 1
+                        tsFilesToAdd.push(file.path); // No JSON file generated for TS/JS in Pass 1
                         break;
                     default:
                         const supportedNonSql = config.supportedExtensions.filter(ext => ext !== '.sql');
@@ -116,22 +117,27 @@ export class Parser {
                         } else if (file.extension === '.sql') {
                              logger.info(`Skipping SQL file due to parser being temporarily disabled: ${file.path}`);
                         }
-                        parsePromise = Promise.resolve(null);
                 }
             } catch (error: any) {
                  logger.error(`Error initiating processing for ${file.path}: ${error.message}`);
-                 parsePromise = Promise.resolve(null);
             }
-             if (parsePromise) {
-                 parsePromises.push(
-                     parsePromise.catch(err => {
+             if (parseTask) {
+                 const task = parseTask;
+                 parseTasks.push(async () => {
+                     try {
+                         return await task();
+                     } catch (err: any) {
                          logger.error(`Parsing failed for ${file.path}: ${err.message}`);
                          return null;
-                     })
-                 );
+                     }
+                 });
              }
         }
 
+        // Bounded, so a large repository doesn't spawn a parser process for every file at once.
+        // Started before the (synchronous) TS/JS parsing below so both make progress together.
+        const parsing = runWithConcurrency(parseTasks, config.parserConcurrency, task => task());
+
         if (tsFilesToAdd.length > 0) {
             this.tsProject.addSourceFilesAtPaths(tsFilesToAdd);
             logger.info(`Added ${tsFilesToAdd.length} TS/JS files to the ts-morph project.`);
@@ -140,7 +146,7 @@ export class Parser {
             await this._parseTsProjectFiles(targetFilePaths);
         }
 
-        await Promise.all(parsePromises);
+        await parsing;
         logger.info('Pass 1 processing completed for all initiated files.');
     }
 
@@ -163,45 +169,69 @@ export class Parser {
             logger.info(`Found ${jsonFiles.length} temporary JSON files to process.`);
             let processedJsonCount = 0;
 
-            for (const file of jsonFiles) {
+            // Read the next file while the current one is parsed and merged, and delete processed files
+            // in the background, so disk I/O overlaps with JSON.parse instead of alternating with it
+            const readTempFile = (file: string): Promise<string> => {
+                const read = fs.readFile(path.join(tempDir, file), 'utf-8');
+                read.catch(() => { /* Reported when awaited in the loop below */ });
+                return read;
+            };
+            const pendingDeletes: Promise<void>[] = [];
+            // JSON.parse allocates a separate copy of every string value, so the few distinct kinds, languages,
+            // relationship types and file paths would otherwise be repeated per node/relationship
+            const internedStrings = new Map<string, string>();
+            const intern = (value: string): string => {
+                const existing = internedStrings.get(value);
+                if (existing !== undefined) {
+                    return existing;
+                }
+                internedStrings.set(value, value);
+                return value;
+            };
+            let nextRead: Promise<string> | null = jsonFiles.length > 0 ? readTempFile(jsonFiles[0]!) : null;
+
+            for (const [index, file] of jsonFiles.entries()) {
                 processedJsonCount++;
                 const filePath = path.join(tempDir, file);
+                const currentRead = nextRead!;
+                nextRead = index + 1 < jsonFiles.length ? readTempFile(jsonFiles[index + 1]!) : null;
                 // logger.debug(`[collectResults] Processing JSON file ${processedJsonCount}/${jsonFiles.length}: ${file}`); // Removed log
                 try {
-                    const content = await fs.readFile(filePath, 'utf-8');
+                    const content = await currentRead;
                     const result: SingleFileParseResult = JSON.parse(content);
                     // logger.debug(`[collectResults] Parsed JSON for: ${file} (Source Path: ${result.filePath})`); // Removed log
 
                     if (result.filePath && result.nodes && result.relationships) {
-                        // Deduplicate nodes within this specific JSON file first
-                        const fileNodeMap = new Map<string, AstNode>();
+                        // Deduplicate nodes within this file and across files in a single pass
+                        const seenInFile = new Set<string>();
                         let intraFileDuplicates = 0;
                         for (const node of result.nodes) {
-                            if (fileNodeMap.has(node.entityId)) {
-                                // logger.warn(`[collectResults] Intra-file duplicate node entityId found in ${result.filePath}: ${node.entityId} (Kind: ${node.kind})`); // Removed log
-                                intraFileDuplicates++;
+                            const entityId = node.entityId;
+                            node.kind = intern(node.kind);
+                            if (node.language) {
+                                node.language = intern(node.language);
                             }
-                            fileNodeMap.set(node.entityId, node);
-                        }
-                        if (intraFileDuplicates > 0) {
-                            logger.warn(`[collectResults] Found ${intraFileDuplicates} intra-file duplicate nodes in ${result.filePath}.`);
-                        }
-
-                        // Add unique nodes from this file to the main map
-                        for (const [entityId, node] of fileNodeMap.entries()) {
-                            if (nodeMap.has(entityId)) {
+                            if (node.filePath) {
+                                node.filePath = intern(node.filePath);
+                            }
+                            if (seenInFile.has(entityId)) {
+                                intraFileDuplicates++;
+                            } else {
+                                seenInFile.add(entityId);
                                 const existingNode = nodeMap.get(entityId);
                                 if (node.kind === 'File' && existingNode?.kind === 'File') {
                                      logger.warn(`[collectResults] Overwriting File node with entityId: ${entityId} (Incoming: ${node.filePath}, Existing: ${existingNode?.filePath})`);
-                                } else if (existingNode?.filePath !== node.filePath) {
-                                    // logger.warn(`[collectResults] Cross-file duplicate node entityId (overwriting): ${entityId} (Kind: ${node.kind}, Incoming: ${node.filePath}, Existing: ${existingNode?.filePath})`); // Removed log
                                 }
                             }
                             nodeMap.set(entityId, node);
                         }
+                        if (intraFileDuplicates > 0) {
+                            logger.warn(`[collectResults] Found ${intraFileDuplicates} intra-file duplicate nodes in ${result.filePath}.`);
+                        }
 
                         // Add relationships to map (duplicates less likely but handle anyway)
                         for (const rel of result.relationships) {
+                             rel.type = intern(rel.type);
                              if (relationshipMap.has(rel.entityId)) {
                                  // logger.warn(`[collectResults] Overwriting relationship with duplicate entityId: ${rel.entityId} (Type: ${rel.type})`); // Removed log
                              }
@@ -212,13 +242,14 @@ export class Parser {
                     } else {
                         logger.warn(`Skipping invalid JSON structure in file: ${file}`);
                     }
-                     await fs.unlink(filePath).catch(err => logger.warn(`Failed to delete temp file ${filePath}: ${err.message}`));
+                     pendingDeletes.push(fs.unlink(filePath).catch(err => logger.warn(`Failed to delete temp file ${filePath}: ${err.message}`)));
 
                 } catch (error: any) {
                     logger.error(`Error processing or deleting temp file ${filePath}: ${error.message}`);
                      try { await fs.unlink(filePath); } catch { /* ignore cleanup error */ }
                 }
             }
+            await Promise.all(pendingDeletes);
 
              // --- REMOVED TS/JS File Node Generation Logic ---
              // --- REMOVED Directory Node Generation Logic ---
@@ -230,27 +261,25 @@ export class Parser {
         // Add results from in-memory TS parsing
         logger.info(`Adding results from ${this.tsResults.size} parsed TS/JS files...`);
         for (const [filePath, result] of this.tsResults.entries()) {
-            // Deduplicate nodes within this specific TS file result first
-            const fileNodeMap = new Map<string, AstNode>();
+            // Deduplicate nodes within this file and across files in a single pass
+            const seenInFile = new Set<string>();
             let intraFileDuplicates = 0;
             for (const node of result.nodes) {
-                if (fileNodeMap.has(node.entityId)) {
+                const entityId = node.entityId;
+                if (seenInFile.has(entityId)) {
                     intraFileDuplicates++;
+                } else {
+                    seenInFile.add(entityId);
+                    if (nodeMap.has(entityId)) {
+                         logger.warn(`[collectResults-TS] Overwriting node with duplicate entityId: ${entityId} (Kind: ${node.kind}, File: ${node.filePath})`);
+                    }
                 }
-                fileNodeMap.set(node.entityId, node);
+                nodeMap.set(entityId, node);
             }
             if (intraFileDuplicates > 0) {
                 logger.warn(`[collectResults-TS] Found ${intraFileDuplicates} intra-file duplicate nodes in ${filePath}.`);
             }
 
-            // Add unique nodes from this file to the main map
-            for (const [entityId, node] of fileNodeMap.entries()) {
-                if (nodeMap.has(entityId)) {
-                     logger.warn(`[collectResults-TS] Overwriting node with duplicate entityId: ${entityId} (Kind: ${node.kind}, File: ${node.filePath})`);
-                }
-                nodeMap.set(entityId, node);
-            }
-
             // Add relationships from this file to the main map
             for (const rel of result.relationships) {
                  if (relationshipMap.has(rel.entityId)) {
@@ -320,7 +349,14 @@ export class Parser {
                 relationships: [],
             };
 
-            const addNode = (node: AstNode) => { result.nodes.push(node); };
+            // Keep the first node per entityId, matching what a find() over result.nodes would return
+            const nodesById = new Map<string, AstNode>([[fileNode.entityId, fileNode]]);
+            const addNode = (node: AstNode) => {
+                result.nodes.push(node);
+                if (!nodesById.has(node.entityId)) {
+                    nodesById.set(node.entityId, node);
+                }
+            };
             const addRelationship = (rel: RelationshipInfo) => { result.relationships.push(rel); };
 
             const context = { // Create ParserContext
@@ -328,6 +364,7 @@ export class Parser {
                 sourceFile: sourceFile,
                 fileNode: fileNode, // Pass the created FileNode
                 result: result,     // Pass the result object
+                nodesById: nodesById,
                 addNode: addNode,
                 addRelationship: addRelationship,
                 generateId: (prefix: string, identifier: string, options?: { line?: number; column?: number }) =>
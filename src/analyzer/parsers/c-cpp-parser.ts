@@ -311,7 +311,7 @@ export class CCppParser {
      * @returns A promise resolving to the path of the temporary result file.
      */
     async parseFile(file: FileInfo): Promise<string> {
-        logger.info(`[CCppParser] Starting C/C++ parsing for: ${file.name}`);
+        logger.debug(`[CCppParser] Starting C/C++ parsing for: ${file.name}`);
         await ensureTempDir();
         const tempFilePath = getTempFilePath(file.path);
         const absoluteFilePath = path.resolve(file.path);
@@ -334,8 +334,8 @@ export class CCppParser {
                 relationships: visitor.relationships,
             };
 
-            await fs.writeFile(tempFilePath, JSON.stringify(result, null, 2));
-            logger.info(`[CCppParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
+            await fs.writeFile(tempFilePath, JSON.stringify(result));
+            logger.debug(`[CCppParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
             return tempFilePath;
 
         } catch (error: any) {
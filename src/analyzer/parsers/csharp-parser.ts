@@ -336,7 +336,7 @@ export class CSharpParser {
      * Parses a single C# file.
      */
     async parseFile(file: FileInfo): Promise<string> {
-        logger.info(`[CSharpParser] Starting C# parsing for: ${file.name}`);
+        logger.debug(`[CSharpParser] Starting C# parsing for: ${file.name}`);
         await ensureTempDir();
         const tempFilePath = getTempFilePath(file.path);
         const absoluteFilePath = path.resolve(file.path);
@@ -354,8 +354,8 @@ export class CSharpParser {
                 relationships: visitor.relationships,
             };
 
-            await fs.writeFile(tempFilePath, JSON.stringify(result, null, 2));
-            logger.info(`[CSharpParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
+            await fs.writeFile(tempFilePath, JSON.stringify(result));
+            logger.debug(`[CSharpParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
             return tempFilePath;
 
         } catch (error: any) {
@@ -325,7 +325,7 @@ export class GoParser {
      * Parses a single Go file.
      */
     async parseFile(file: FileInfo): Promise<string> {
-        logger.info(`[GoParser] Starting Go parsing for: ${file.name}`);
+        logger.debug(`[GoParser] Starting Go parsing for: ${file.name}`);
         await ensureTempDir();
         const tempFilePath = getTempFilePath(file.path);
         const absoluteFilePath = path.resolve(file.path);
@@ -343,8 +343,8 @@ export class GoParser {
                 relationships: visitor.relationships,
             };
 
-            await fs.writeFile(tempFilePath, JSON.stringify(result, null, 2));
-            logger.info(`[GoParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
+            await fs.writeFile(tempFilePath, JSON.stringify(result));
+            logger.debug(`[GoParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
             return tempFilePath;
 
         } catch (error: any) {
@@ -358,7 +358,7 @@ export class JavaParser {
      * Parses a single Java file.
      */
     async parseFile(file: FileInfo): Promise<string> {
-        logger.info(`[JavaParser] Starting Java parsing for: ${file.name}`);
+        logger.debug(`[JavaParser] Starting Java parsing for: ${file.name}`);
         await ensureTempDir();
         const tempFilePath = getTempFilePath(file.path);
         const absoluteFilePath = path.resolve(file.path);
@@ -376,8 +376,8 @@ export class JavaParser {
                 relationships: visitor.relationships,
             };
 
-            await fs.writeFile(tempFilePath, JSON.stringify(result, null, 2));
-            logger.info(`[JavaParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
+            await fs.writeFile(tempFilePath, JSON.stringify(result));
+            logger.debug(`[JavaParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
             return tempFilePath;
 
         } catch (error: any) {
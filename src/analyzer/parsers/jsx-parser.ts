@@ -102,7 +102,7 @@ export function parseJsx(context: ParserContext): void {
                          };
                          const parentInstanceId = `${fileNode.filePath}:${parentTagName}:${parentLocation.startLine}:${parentLocation.startColumn}`;
                          const parentEntityId = generateEntityId('jsxelement', parentInstanceId);
-                         const foundParentJsxAstNode = result.nodes.find(n => n.entityId === parentEntityId) as JSXElementNode | undefined;
+                         const foundParentJsxAstNode = context.nodesById.get(parentEntityId) as JSXElementNode | undefined;
                          if (foundParentJsxAstNode) {
                              parentAstNode = foundParentJsxAstNode;
                              break;
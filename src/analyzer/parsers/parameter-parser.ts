@@ -47,7 +47,7 @@ export function parseParameters(
                 };
 
                 // Avoid adding duplicate nodes if analysis runs multiple times (though less likely with new structure)
-                if (!context.result.nodes.some((n: AstNode) => n.entityId === entityId)) {
+                if (!context.nodesById.has(entityId)) {
                     addNode(paramNode);
 
                     // Add HAS_PARAMETER relationship (Function/Method -> Parameter)
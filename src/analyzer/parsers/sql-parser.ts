@@ -230,7 +230,7 @@ export class SqlParser {
      * Parses a single SQL file.
      */
     async parseFile(file: FileInfo): Promise<string> {
-        logger.info(`[SqlParser] Starting SQL parsing for: ${file.name}`);
+        logger.debug(`[SqlParser] Starting SQL parsing for: ${file.name}`);
         await ensureTempDir();
         const tempFilePath = getTempFilePath(file.path);
         const absoluteFilePath = path.resolve(file.path);
@@ -248,8 +248,8 @@ export class SqlParser {
                 relationships: visitor.relationships,
             };
 
-            await fs.writeFile(tempFilePath, JSON.stringify(result, null, 2));
-            logger.info(`[SqlParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
+            await fs.writeFile(tempFilePath, JSON.stringify(result));
+            logger.debug(`[SqlParser] Pass 1 completed for: ${file.name}. Nodes: ${result.nodes.length}, Rels: ${result.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
             return tempFilePath;
 
         } catch (error: any) {
@@ -35,7 +35,7 @@ export class PythonAstParser {
      * @throws {ParserError} If the Python script fails or returns an error.
      */
     async parseFile(file: FileInfo): Promise<string> {
-        logger.info(`[PythonAstParser] Starting Python parsing for: ${file.name}`);
+        logger.debug(`[PythonAstParser] Starting Python parsing for: ${file.name}`);
         await ensureTempDir(); // Ensure temp directory exists
 
         const tempFilePath = getTempFilePath(file.path);
@@ -55,7 +55,9 @@ export class PythonAstParser {
             }
 
             // --- DEBUG LOG: Inspect raw result ---
-            logger.debug(`[PythonAstParser] Raw result from python_parser.py for ${file.name}: ${JSON.stringify(result, null, 2)}`);
+            if (logger.isDebugEnabled()) {
+                logger.debug(`[PythonAstParser] Raw result from python_parser.py for ${file.name}: ${JSON.stringify(result, null, 2)}`);
+            }
             // --- END DEBUG LOG ---
 
 
@@ -65,26 +67,29 @@ export class PythonAstParser {
             // For now, we assume the structure is compatible. We just need to add instance IDs.
 
             const instanceCounter: InstanceCounter = { count: 0 };
+            const createdAt = new Date().toISOString(); // One timestamp per file instead of one Date per node/relationship
+            // The parsed objects are owned by this method, so they are completed in place rather than
+            // spread into per-node/per-relationship copies
+            for (const node of result.nodes) {
+                // Generate instance ID based on Python output location/name
+                node.id = generateInstanceId(instanceCounter, node.kind.toLowerCase(), node.name, { line: node.startLine, column: node.startColumn });
+                node.createdAt = createdAt; // Add timestamp
+            }
+            for (const rel of result.relationships) {
+                 // Generate instance ID for relationship
+                 rel.id = generateInstanceId(instanceCounter, rel.type.toLowerCase(), `${rel.sourceId}:${rel.targetId}`); // Simple ID for rel
+                 rel.createdAt = createdAt; // Add timestamp
+                 rel.weight = rel.weight ?? 1; // Default weight
+            }
             const finalResult: SingleFileParseResult = {
                 filePath: result.filePath, // Use path from result
-                nodes: result.nodes.map(node => ({
-                    ...node,
-                    // Generate instance ID based on Python output location/name
-                    id: generateInstanceId(instanceCounter, node.kind.toLowerCase(), node.name, { line: node.startLine, column: node.startColumn }),
-                    createdAt: new Date().toISOString(), // Add timestamp
-                })),
-                relationships: result.relationships.map(rel => ({
-                    ...rel,
-                     // Generate instance ID for relationship
-                     id: generateInstanceId(instanceCounter, rel.type.toLowerCase(), `${rel.sourceId}:${rel.targetId}`), // Simple ID for rel
-                     createdAt: new Date().toISOString(), // Add timestamp
-                     weight: rel.weight ?? 1, // Default weight
-                })),
+                nodes: result.nodes,
+                relationships: result.relationships,
             };
 
 
-            await fs.writeFile(tempFilePath, JSON.stringify(finalResult, null, 2));
-            logger.info(`[PythonAstParser] Pass 1 completed for: ${file.name}. Nodes: ${finalResult.nodes.length}, Rels: ${finalResult.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
+            await fs.writeFile(tempFilePath, JSON.stringify(finalResult)); // Machine-read by collectResults only, so no pretty-printing
+            logger.debug(`[PythonAstParser] Pass 1 completed for: ${file.name}. Nodes: ${finalResult.nodes.length}, Rels: ${finalResult.relationships.length}. Saved to ${path.basename(tempFilePath)}`);
             return tempFilePath;
 
         } catch (error: any) {
@@ -114,17 +119,19 @@ export class PythonAstParser {
             }
             // --- End Debug ---
             const scriptPath = path.resolve(process.cwd(), 'python_parser.py'); // Assuming script is in root
-            logger.debug(`[PythonAstParser] Executing: ${this.pythonExecutable} "${scriptPath}" "${filePath}"`);
+            logger.debug(`[PythonAstParser] Executing: ${this.pythonExecutable} -S "${scriptPath}" "${filePath}"`);
 
-            const childProcess = spawn(this.pythonExecutable, [scriptPath, filePath], { cwd: process.cwd() }); // Explicitly set CWD
+            // python_parser.py only needs the standard library, so skip importing `site` (and scanning
+            // site-packages/.pth files) on every per-file interpreter start-up
+            const childProcess = spawn(this.pythonExecutable, ['-S', scriptPath, filePath], { cwd: process.cwd() }); // Explicitly set CWD
  // Renamed variable
 
-            let stdoutData = '';
+            const stdoutChunks: Buffer[] = []; // Decoded once on close rather than per chunk
             let stderrData = '';
 
-            childProcess.stdout.on('data', (data) => {
+            childProcess.stdout.on('data', (data: Buffer) => {
  // Use childProcess
-                stdoutData += data.toString();
+                stdoutChunks.push(data);
             });
 
             childProcess.stderr.on('data', (data) => {
@@ -145,7 +152,7 @@ export class PythonAstParser {
                     if (stderrData) {
                          logger.warn(`[PythonAstParser] Python script produced stderr output (but exited OK): ${stderrData.trim()}`);
                     }
-                    resolve(stdoutData);
+                    resolve(Buffer.concat(stdoutChunks).toString('utf8'));
                 } else {
                     // Try to parse stderr for a JSON error message from the script
                     try {
@@ -14,15 +14,29 @@ const logger = createContextLogger('RelationshipResolver');
  */
 export class RelationshipResolver {
     private nodeIndex: Map<string, AstNode>; // Map entityId -> AstNode
+    private nodesByFilePath: Map<string, AstNode[]>; // Map filePath -> nodes declared in that file
     private relationships: RelationshipInfo[];
-    private pass1RelationshipIds: Set<string>; // Store entityIds of relationships found in Pass 1
     private context: ResolverContext | null = null; // Context for Pass 2 operations
 
     constructor(allNodes: AstNode[], pass1Relationships: RelationshipInfo[]) {
-        this.nodeIndex = new Map(allNodes.map(node => [node.entityId, node]));
+        // Filled with a loop rather than from a mapped array of [key, value] pairs, which would briefly double the footprint
+        this.nodeIndex = new Map();
+        for (const node of allNodes) {
+            this.nodeIndex.set(node.entityId, node);
+        }
+        // Per-file lookups are built from the deduplicated index, so each entityId appears once
+        this.nodesByFilePath = new Map();
+        for (const node of this.nodeIndex.values()) {
+            const fileNodes = this.nodesByFilePath.get(node.filePath);
+            if (fileNodes) {
+                fileNodes.push(node);
+            } else {
+                this.nodesByFilePath.set(node.filePath, [node]);
+            }
+        }
         this.relationships = [];
-        this.pass1RelationshipIds = new Set(pass1Relationships.map(rel => rel.entityId));
-        logger.info(`RelationshipResolver initialized with ${this.nodeIndex.size} nodes and ${this.pass1RelationshipIds.size} Pass 1 relationship IDs.`);
+        // Pass 1 relationships are only counted here; the caller merges them with the Pass 2 results
+        logger.info(`RelationshipResolver initialized with ${this.nodeIndex.size} nodes and ${pass1Relationships.length} Pass 1 relationships.`);
     }
 
     /**
@@ -38,6 +52,7 @@ export class RelationshipResolver {
 
         this.context = {
             nodeIndex: this.nodeIndex,
+            nodesByFilePath: this.nodesByFilePath,
             addRelationship: (rel) => {
                 if (!addedRelEntityIds.has(rel.entityId)) {
                     this.relationships.push(rel);
@@ -53,10 +68,12 @@ export class RelationshipResolver {
 
         logger.info('Starting Pass 2 relationship resolution...');
 
-        // Iterate through all files represented by nodes from Pass 1
-        const fileNodes = Array.from(this.nodeIndex.values()).filter(node => node.kind === 'File' || node.kind === 'PythonModule'); // Include PythonModule
-
-        for (const fileNode of fileNodes) {
+        // Iterate through all files represented by nodes from Pass 1 (File and PythonModule kinds),
+        // skipping other nodes in place rather than copying and filtering the whole index first
+        for (const fileNode of this.nodeIndex.values()) {
+            if (fileNode.kind !== 'File' && fileNode.kind !== 'PythonModule') {
+                continue;
+            }
             logger.debug(`Resolving relationships for file: ${fileNode.name} (${fileNode.language})`);
             const currentContext = this.context!;
             let sourceFile: SourceFile | undefined;
@@ -14,11 +14,11 @@ export function resolveCIncludes(sourceFile: SourceFile, fileNode: AstNode, cont
         return;
     }
 
-    const { addRelationship, generateId, generateEntityId, logger, now, nodeIndex } = context;
+    const { addRelationship, generateId, generateEntityId, logger, now, nodesByFilePath } = context;
 
     // Find IncludeDirective nodes created in Pass 1 for this file
-    const includeDirectives = Array.from(nodeIndex.values()).filter(
-        node => node.kind === 'IncludeDirective' && node.filePath === fileNode.filePath
+    const includeDirectives = (nodesByFilePath.get(fileNode.filePath) ?? []).filter(
+        node => node.kind === 'IncludeDirective'
     ) as IncludeDirectiveNode[]; // Type assertion
 
     logger.debug(`[resolveCIncludes] Found ${includeDirectives.length} include directives in ${fileNode.name}`);
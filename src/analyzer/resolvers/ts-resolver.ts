@@ -149,10 +149,9 @@ export function resolveTsModules(sourceFile: SourceFile, fileNode: AstNode, cont
             // Resolve default import
             if (defaultImportName) {
                  // Cast n to AstNode
-                 const targetNode = Array.from(nodeIndex.values()).find(n =>
-                    (n as AstNode).filePath === targetFileNode!.filePath &&
-                    (n as AstNode).properties?.isDefaultExport === true // Find the default export
-                ) as AstNode | undefined; // Add type assertion
+                 const targetNode = context.nodesByFilePath.get(targetFileNode.filePath)?.find(n =>
+                    n.properties?.isDefaultExport === true // Find the default export
+                );
 
                  if (targetNode) { // Check if targetNode is found
                     const resolvesRelEntityId = generateEntityId('resolves_import', `${importAstNode.entityId}:${targetNode.entityId}:default`);
@@ -324,8 +323,10 @@ export function resolveTsCrossFileInteractions(sourceFile: SourceFile, fileNode:
          const body = funcDecl.getBody();
          if (!body) continue;
          const sourceTargetInfo = getTargetDeclarationInfo(funcDecl, fileNode.filePath, context.resolveImportPath, context.logger);
-         // --- DEBUG LOG ---
-         logger.debug(`[resolveTsCrossFileInteractions] Processing function: ${funcDecl.getName() ?? 'anonymous'}. Generated sourceTargetInfo: ${JSON.stringify(sourceTargetInfo)}`);
+         // --- DEBUG LOG --- (runs for every function, so only serialize when debug output is on)
+         if (logger.isDebugEnabled()) {
+             logger.debug(`[resolveTsCrossFileInteractions] Processing function: ${funcDecl.getName() ?? 'anonymous'}. Generated sourceTargetInfo: ${JSON.stringify(sourceTargetInfo)}`);
+         }
          // --- END DEBUG LOG ---
          const sourceNode = sourceTargetInfo ? nodeIndex.get(sourceTargetInfo.entityId) : undefined;
          if (sourceNode) {
@@ -340,10 +341,12 @@ export function resolveTsCrossFileInteractions(sourceFile: SourceFile, fileNode:
          const body = Node.isMethodDeclaration(methodDecl) ? methodDecl.getBody() : undefined;
          if (!body) continue;
          const sourceTargetInfo = getTargetDeclarationInfo(methodDecl, fileNode.filePath, context.resolveImportPath, context.logger);
-         // --- DEBUG LOG ---
-         // Use type guard before accessing getName
-         const methodName = Node.isMethodDeclaration(methodDecl) ? methodDecl.getName() : 'anonymous';
-         logger.debug(`[resolveTsCrossFileInteractions] Processing method: ${methodName}. Generated sourceTargetInfo: ${JSON.stringify(sourceTargetInfo)}`);
+         // --- DEBUG LOG --- (runs for every method, so only serialize when debug output is on)
+         if (logger.isDebugEnabled()) {
+             // Use type guard before accessing getName
+             const methodName = Node.isMethodDeclaration(methodDecl) ? methodDecl.getName() : 'anonymous';
+             logger.debug(`[resolveTsCrossFileInteractions] Processing method: ${methodName}. Generated sourceTargetInfo: ${JSON.stringify(sourceTargetInfo)}`);
+         }
          // --- END DEBUG LOG ---
          const sourceNode = sourceTargetInfo ? nodeIndex.get(sourceTargetInfo.entityId) : undefined;
          if (sourceNode) {
@@ -360,8 +363,28 @@ export function resolveTsCrossFileInteractions(sourceFile: SourceFile, fileNode:
 function analyzeTsBodyInteractions(body: Node, sourceNode: AstNode, context: ResolverContext): void {
      const { addRelationship, generateId, generateEntityId, logger, now, nodeIndex, resolveImportPath } = context;
 
+     // Collect calls, assignments and try statements in one walk of the body instead of one walk per kind
+     // (descendants are visited in the same pre-order as getDescendantsOfKind, so relationship order is unchanged)
+     const callExpressions: Node[] = [];
+     const assignments: BinaryExpression[] = [];
+     const tryStatements: Node[] = [];
+     body.forEachDescendant(descendant => {
+         switch (descendant.getKind()) {
+             case SK.CallExpression:
+                 callExpressions.push(descendant);
+                 break;
+             case SK.BinaryExpression:
+                 if (Node.isBinaryExpression(descendant) && descendant.getOperatorToken().getKind() === SK.EqualsToken) {
+                     assignments.push(descendant);
+                 }
+                 break;
+             case SK.TryStatement:
+                 tryStatements.push(descendant);
+                 break;
+         }
+     });
+
      // Analyze Calls
-     const callExpressions = body.getDescendantsOfKind(SK.CallExpression);
      if (callExpressions.length > 0) logger.debug(`[analyzeTsBodyInteractions] Found ${callExpressions.length} call expressions in ${sourceNode.name}`);
      for (const callExpr of callExpressions) {
          const expression = Node.isCallExpression(callExpr) ? callExpr.getExpression() : undefined;
@@ -395,9 +418,6 @@ function analyzeTsBodyInteractions(body: Node, sourceNode: AstNode, context: Res
      }
 
      // Analyze Assignments (Mutations)
-     const assignments = body.getDescendantsOfKind(SK.BinaryExpression).filter((expr): expr is BinaryExpression =>
-         Node.isBinaryExpression(expr) && expr.getOperatorToken().getKind() === SK.EqualsToken
-     );
      for (const assignment of assignments) {
           const leftHandSide = assignment.getLeft();
           const nodeToResolve = Node.isPropertyAccessExpression(leftHandSide) ? leftHandSide.getNameNode() : leftHandSide;
@@ -425,7 +445,6 @@ function analyzeTsBodyInteractions(body: Node, sourceNode: AstNode, context: Res
      }
 
      // Analyze Try/Catch (HANDLES_ERROR)
-     const tryStatements = body.getDescendantsOfKind(SK.TryStatement);
      for (const tryStmt of tryStatements) {
          const catchClause = Node.isTryStatement(tryStmt) ? tryStmt.getCatchClause() : undefined;
          if (!catchClause) continue;
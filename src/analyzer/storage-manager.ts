@@ -1,76 +1,288 @@
 import { Neo4jClient } from '../database/neo4j-client.js';
 import { AstNode, RelationshipInfo } from './types.js';
 import { createContextLogger } from '../utils/logger.js';
-import { generateNodeLabelCypher } from './cypher-utils.js'; // Import the new utility
+import { generateStaleLabelRemoveClause, escapeCypherIdentifier, compactCypher } from './cypher-utils.js';
+import { NODE_LABELS, BASE_NODE_LABEL } from '../database/schema.js';
 import config from '../config/index.js';
 import { Neo4jError } from '../utils/errors.js';
+import { runWithConcurrency } from '../utils/concurrency.js';
+import type { QueryResult } from 'neo4j-driver';
 
 const logger = createContextLogger('StorageManager');
 
+/** Relationships sharing one source node, before property preparation. */
+type SourceGroup = { sourceId: string; rels: RelationshipInfo[] };
+/** Prepared relationships sharing one source node, written as a single UNWIND row. */
+type RelationshipGroup = { sourceId: string; rels: Record<string, any>[] };
+
+/** Write statistics (nodesCreated, relationshipsCreated, propertiesSet, ...) summed across batches. */
+export type WriteCounters = Record<string, number>;
+
+// Shared result for empty inputs; frozen so a caller can't mutate it for everyone else
+const EMPTY_COUNTERS = Object.freeze({}) as WriteCounters;
+// Shared properties map for relationships without any; never mutated
+const EMPTY_PROPERTIES: Record<string, any> = Object.freeze({});
+
+/**
+ * Adds update counters into a running total, mutating the plain totals object in place.
+ * @param totals - The running totals.
+ * @param updates - Counters to add, e.g. `result.summary.counters.updates()`.
+ */
+function addCounters(totals: WriteCounters, updates: WriteCounters): void {
+    for (const [key, value] of Object.entries(updates)) {
+        if (value) {
+            totals[key] = (totals[key] ?? 0) + value;
+        }
+    }
+}
+
+// --- Cypher Queries ---
+// Built once per node kind / relationship type and reused, so every batch sends identical query text
+// (no per-batch string building, and the server's plan cache keyed on query text keeps hitting).
+
+// Per-row body for kinds without a schema label: no kind label to set, but any earlier kind label is removed
+const UNLABELED_NODE_MERGE_BODY = compactCypher(`
+            MERGE (n:${BASE_NODE_LABEL} { entityId: properties.entityId })
+            SET n = properties
+            ${generateStaleLabelRemoveClause()}
+        `);
+
+const KNOWN_NODE_LABELS = new Set(NODE_LABELS);
+const labeledNodeMergeBodies = new Map<string, string>();
+
+/**
+ * Returns the (cached) per-row node MERGE body for a kind listed in NODE_LABELS.
+ * The MERGE is anchored on BASE_NODE_LABEL, so it is backed by that label's entityId uniqueness constraint
+ * and also adopts endpoint placeholders created by relationship writes; the kind label is then set statically
+ * and the other kind labels are removed, in case the entity's kind changed since an earlier run.
+ * @param kind - A node kind that is also a schema label.
+ */
+function getLabeledNodeMergeBody(kind: string): string {
+    let body = labeledNodeMergeBodies.get(kind);
+    if (!body) {
+        body = compactCypher(`
+            MERGE (n:${BASE_NODE_LABEL} { entityId: properties.entityId })
+            SET n = properties, n:\`${kind}\`
+            ${generateStaleLabelRemoveClause(kind)}
+        `);
+        labeledNodeMergeBodies.set(kind, body);
+    }
+    return body;
+}
+
+const nodeMergeQueries = new Map<string, string>();
+
+/**
+ * Returns the (cached) node batch query: an UNWIND of `$batch` rows (bound as `properties`) into a MERGE body.
+ * @param body - A per-row MERGE body, UNLABELED_NODE_MERGE_BODY or one from getLabeledNodeMergeBody.
+ * @param rowsPerTransaction - If set, the body runs in `CALL { ... } IN CONCURRENT TRANSACTIONS` of this many rows
+ *                             (Neo4j 5.21+); otherwise the whole batch runs in the caller's transaction.
+ */
+function getNodeMergeQuery(body: string, rowsPerTransaction?: number): string {
+    const cacheKey = `${rowsPerTransaction ?? 0}:${body}`;
+    let cypher = nodeMergeQueries.get(cacheKey);
+    if (!cypher) {
+        cypher = rowsPerTransaction
+            ? `UNWIND $batch AS properties CALL { WITH properties ${body} } IN CONCURRENT TRANSACTIONS OF ${rowsPerTransaction} ROWS`
+            : `UNWIND $batch AS properties ${body}`;
+        nodeMergeQueries.set(cacheKey, cypher);
+    }
+    return cypher;
+}
+
+const relationshipMergeQueries = new Map<string, string>();
+const concurrentRelationshipMergeQueries = new Map<string, string>();
+
+/**
+ * Returns the (cached) grouped relationship MERGE query for a relationship type.
+ * @param relationshipType - The relationship type to MERGE.
+ */
+function getRelationshipMergeQuery(relationshipType: string): string {
+    let cypher = relationshipMergeQueries.get(relationshipType);
+    if (!cypher) {
+        cypher = compactCypher(`
+            UNWIND $batch AS group
+            MERGE (source:${BASE_NODE_LABEL} { entityId: group.sourceId })
+            WITH source, group
+            UNWIND group.rels AS relData
+            MERGE (target:${BASE_NODE_LABEL} { entityId: relData.targetId })
+            MERGE (source)-[r:${escapeCypherIdentifier(relationshipType)} { entityId: relData.entityId }]->(target)
+            ON CREATE SET r = relData.properties, r.type = $type, r.createdAt = relData.createdAt, r.weight = relData.weight
+            ON MATCH SET r += relData.properties
+        `);
+        relationshipMergeQueries.set(relationshipType, cypher);
+    }
+    return cypher;
+}
+
+/**
+ * Returns the (cached) `IN CONCURRENT TRANSACTIONS` variant of the grouped relationship MERGE query.
+ * Endpoints normally exist already (nodes are saved first), so concurrent MERGEs rarely race on creation.
+ * @param relationshipType - The relationship type to MERGE.
+ * @param rowsPerTransaction - Number of source groups committed per server-side transaction.
+ */
+function getConcurrentRelationshipMergeQuery(relationshipType: string, rowsPerTransaction: number): string {
+    const cacheKey = `${relationshipType}:${rowsPerTransaction}`;
+    let cypher = concurrentRelationshipMergeQueries.get(cacheKey);
+    if (!cypher) {
+        cypher = compactCypher(`
+            UNWIND $batch AS group
+            CALL {
+                WITH group
+                MERGE (source:${BASE_NODE_LABEL} { entityId: group.sourceId })
+                WITH source, group
+                UNWIND group.rels AS relData
+                MERGE (target:${BASE_NODE_LABEL} { entityId: relData.targetId })
+                MERGE (source)-[r:${escapeCypherIdentifier(relationshipType)} { entityId: relData.entityId }]->(target)
+                ON CREATE SET r = relData.properties, r.type = $type, r.createdAt = relData.createdAt, r.weight = relData.weight
+                ON MATCH SET r += relData.properties
+            } IN CONCURRENT TRANSACTIONS OF ${rowsPerTransaction} ROWS
+        `);
+        concurrentRelationshipMergeQueries.set(cacheKey, cypher);
+    }
+    return cypher;
+}
+
 /**
  * Manages batch writing of nodes and relationships to the Neo4j database.
  */
 export class StorageManager {
     private neo4jClient: Neo4jClient;
     private batchSize: number;
+    private concurrency: number;
 
     constructor(neo4jClient: Neo4jClient) {
         this.neo4jClient = neo4jClient;
         this.batchSize = config.storageBatchSize;
-        logger.info(`StorageManager initialized with batch size: ${this.batchSize}`);
+        this.concurrency = config.storageConcurrency;
+        logger.info(`StorageManager initialized with batch size: ${this.batchSize}, concurrency: ${this.concurrency}`);
     }
 
     /**
      * Saves an array of AstNode objects to Neo4j in batches using MERGE.
      * Assumes the input 'nodes' array has already been deduplicated by entityId by the caller.
-     * Uses a simple UNWIND + MERGE + SET Cypher query.
+     * Every MERGE is anchored on BASE_NODE_LABEL (and thus its entityId constraint). Nodes are grouped by kind
+     * so each batch sets its kind label statically; kinds without a schema label get no kind label.
+     * On Neo4j 5.21+ larger chunks are sent one at a time and the server commits them in concurrent transactions
+     * of `storageBatchSize` rows, as for relationships; otherwise batches are written by `storageConcurrency` writers.
      * @param nodes - The array of unique AstNode objects to save.
+     * @returns Write counters summed over all batches.
      */
-    async saveNodesBatch(nodes: AstNode[]): Promise<void> {
+    async saveNodesBatch(nodes: AstNode[]): Promise<WriteCounters> {
         if (nodes.length === 0) {
             logger.debug('No nodes provided to saveNodesBatch.');
-            return;
+            return EMPTY_COUNTERS;
         }
 
         // Assume input `nodes` are already deduplicated by the caller (Parser.collectResults)
         logger.info(`Saving ${nodes.length} unique nodes to database...`);
 
-        const { removeClause, setLabelClauses } = generateNodeLabelCypher();
-
-        for (let i = 0; i < nodes.length; i += this.batchSize) {
-             const batch = nodes.slice(i, i + this.batchSize);
+        const nodesByKind = new Map<string, AstNode[]>();
+        for (const node of nodes) {
+            const group = nodesByKind.get(node.kind);
+            if (group) {
+                group.push(node);
+            } else {
+                nodesByKind.set(node.kind, [node]);
+            }
+        }
 
-             if (batch.length === 0) {
-                 continue;
-             }
+        const useConcurrentTransactions = await this.neo4jClient.supportsConcurrentTransactions('StorageManager-Nodes');
+        const rowsPerTransaction = useConcurrentTransactions ? this.batchSize : undefined;
+        const rowsPerJob = useConcurrentTransactions ? this.batchSize * this.concurrency : this.batchSize;
 
-            const preparedBatch = batch.map(node => ({
-                entityId: node.entityId,
-                kind: node.kind,
-                properties: this.prepareNodeProperties(node)
-            }));
+        // Jobs are index ranges into the per-kind lists; each batch is sliced out only when its worker starts
+        const jobs: { kind: string; cypher: string; kindNodes: AstNode[]; start: number }[] = [];
+        for (const [kind, kindNodes] of nodesByKind) {
+            const body = KNOWN_NODE_LABELS.has(kind) ? getLabeledNodeMergeBody(kind) : UNLABELED_NODE_MERGE_BODY;
+            const cypher = getNodeMergeQuery(body, rowsPerTransaction);
+            for (let i = 0; i < kindNodes.length; i += rowsPerJob) {
+                jobs.push({ kind, cypher, kindNodes, start: i });
+            }
+        }
 
-            // Simple UNWIND + MERGE + SET query
-            const cypher = `
-                UNWIND $batch AS nodeData
-                MERGE (n { entityId: nodeData.entityId })
-                SET n = nodeData.properties
- // Revert to original SET
-                ${removeClause}
-                WITH n, nodeData.kind AS kind
-                ${setLabelClauses}
-            `;
+        // Node batches touch disjoint entityIds, so they can be written over separate pooled connections.
+        // With concurrent transactions the server already parallelises each chunk, so chunks go one at a time.
+        let processed = 0;
+        const counters: WriteCounters = {};
+        await runWithConcurrency(jobs, useConcurrentTransactions ? 1 : this.concurrency, async ({ kind, cypher, kindNodes, start }, index) => {
+            // Each batch holds a single kind whose label is part of the query, so rows are just the property maps
+            // (which carry entityId)
+            const end = Math.min(start + rowsPerJob, kindNodes.length);
+            const preparedBatch: Record<string, any>[] = new Array(end - start);
+            for (let i = start; i < end; i++) {
+                preparedBatch[i - start] = this.prepareNodeProperties(kindNodes[i] as AstNode);
+            }
 
             try {
-                await this.neo4jClient.runTransaction(cypher, { batch: preparedBatch }, 'WRITE', 'StorageManager-Nodes');
-                logger.debug(`Saved batch of ${preparedBatch.length} nodes (Total processed: ${Math.min(i + preparedBatch.length, nodes.length)}/${nodes.length})`);
+                const params = { batch: preparedBatch };
+                // CALL { } IN TRANSACTIONS can't run inside a managed transaction, so it goes through auto-commit
+                const result = useConcurrentTransactions
+                    ? await this.neo4jClient.runAutoCommit<QueryResult>(cypher, params, 'WRITE', 'StorageManager-Nodes')
+                    : await this.neo4jClient.runTransaction<QueryResult>(cypher, params, 'WRITE', 'StorageManager-Nodes');
+                addCounters(counters, result.summary.counters.updates());
+                processed += preparedBatch.length;
+                if (logger.isDebugEnabled()) {
+                    logger.debug(`Saved batch of ${preparedBatch.length} ${kind} nodes (Total processed: ${processed}/${nodes.length})`);
+                }
             } catch (error: any) {
-                logger.error(`Failed to save node batch (index ${i})`, { error: error.message, code: error.code });
+                logger.error(`Failed to save node batch (index ${index}, kind: ${kind})`, { error: error.message, code: error.code });
                  logger.error(`Failing node batch data (first 5): ${JSON.stringify(preparedBatch.slice(0, 5), null, 2)}`);
                 throw new Neo4jError(`Failed to save node batch: ${error.message}`, { originalError: error, code: error.code });
             }
+        });
+        logger.info(`Finished saving ${nodes.length} unique nodes.`, { counters });
+        return counters;
+    }
+
+    /**
+     * Saves relationships grouped by type.
+     * Without server-side concurrent transactions, the source-grouped batches of all types form one work queue
+     * drained by `storageConcurrency` writers, so a single large type no longer funnels through one writer.
+     * Batches are disjoint by source node; overlapping targets can still deadlock, which executeWrite retries.
+     * On servers with concurrent transactions each type is already parallelised server-side,
+     * so types are then written one at a time to avoid deadlock retries between types.
+     * @param relationshipsByType - Unique relationships keyed by relationship type.
+     * @returns Write counters summed over all types.
+     */
+    async saveRelationshipsByType(relationshipsByType: Map<string, RelationshipInfo[]>): Promise<WriteCounters> {
+        if (relationshipsByType.size === 0) {
+            logger.debug('No relationships provided to saveRelationshipsByType.');
+            return EMPTY_COUNTERS;
+        }
+
+        // Reject unusable types before any batch is sent, rather than failing part-way through the write
+        for (const type of relationshipsByType.keys()) {
+            escapeCypherIdentifier(type);
+        }
+
+        const counters: WriteCounters = {};
+        if (await this.neo4jClient.supportsConcurrentTransactions('StorageManager-Rels')) {
+            for (const [type, relationships] of relationshipsByType) {
+                addCounters(counters, await this.saveRelationshipsBatch(type, relationships));
+            }
+        } else {
+            const jobs: { type: string; cypher: string; groupBatch: SourceGroup[] }[] = [];
+            for (const [type, relationships] of relationshipsByType) {
+                const cypher = getRelationshipMergeQuery(type);
+                for (const groupBatch of this.batchGroups(this.groupBySource(relationships))) {
+                    jobs.push({ type, cypher, groupBatch });
+                }
+            }
+            await runWithConcurrency(jobs, this.concurrency, async ({ type, cypher, groupBatch }, index) => {
+                addCounters(counters, await this.writeRelationshipBatch(type, cypher, groupBatch, index));
+            });
+        }
+
+        // One summary line for all types instead of start/finish lines per type
+        let total = 0;
+        const countsByType: Record<string, number> = {};
+        for (const [type, relationships] of relationshipsByType) {
+            total += relationships.length;
+            countsByType[type] = relationships.length;
         }
-        logger.info(`Finished saving ${nodes.length} unique nodes.`);
+        logger.info(`Finished saving ${total} unique relationships across ${relationshipsByType.size} types.`, { countsByType, counters });
+        return counters;
     }
 
     /**
@@ -78,83 +290,200 @@ export class StorageManager {
      * Assumes the input 'relationships' array has already been deduplicated by entityId.
      * @param relationshipType - The specific type of relationships in this batch.
      * @param relationships - The array of unique RelationshipInfo objects to save.
+     * @returns Write counters summed over all batches.
      */
-    async saveRelationshipsBatch(relationshipType: string, relationships: RelationshipInfo[]): Promise<void> {
+    async saveRelationshipsBatch(relationshipType: string, relationships: RelationshipInfo[]): Promise<WriteCounters> {
         if (relationships.length === 0) {
             logger.debug(`No relationships of type ${relationshipType} provided to saveRelationshipsBatch.`);
-            return;
+            return EMPTY_COUNTERS;
         }
 
         // Assume input `relationships` are already deduplicated by the caller (Parser.collectResults)
-        logger.info(`Saving ${relationships.length} unique relationships of type ${relationshipType} to database...`);
-
-        for (let i = 0; i < relationships.length; i += this.batchSize) {
-            const batch = relationships.slice(i, i + this.batchSize);
-
-             if (batch.length === 0) {
-                 continue;
-             }
-
-             const preparedBatch = batch.map(rel => this.prepareRelationshipProperties(rel));
-
-            // Use MATCH for nodes, assuming they were created in saveNodesBatch
-            const cypher = `
-                UNWIND $batch AS relData
-                 MERGE (source { entityId: relData.sourceId })
- // Use MERGE instead of MATCH
-                 MERGE (target { entityId: relData.targetId })
- // Use MERGE instead of MATCH
-                 MERGE (source)-[r:\`${relationshipType}\` { entityId: relData.entityId }]->(target) // Merge relationship on entityId
-                ON CREATE SET r = relData.properties, r.type = relData.type, r.createdAt = relData.createdAt, r.weight = relData.weight
-                ON MATCH SET r += relData.properties
-            `;
+        logger.debug(`Saving ${relationships.length} unique relationships of type ${relationshipType} to database...`);
+
+        // On Neo4j 5.21+ let the server split the rows into concurrently executing transactions
+        if (await this.neo4jClient.supportsConcurrentTransactions('StorageManager-Rels')) {
+            return this.saveRelationshipsConcurrently(relationshipType, relationships);
+        }
 
+        // Group by source so each source node is looked up (and locked) once per batch instead of once per row
+        const groupBatches = this.batchGroups(this.groupBySource(relationships));
+        const cypher = getRelationshipMergeQuery(relationshipType);
+
+        const counters: WriteCounters = {};
+        for (const [index, groupBatch] of groupBatches.entries()) {
+            addCounters(counters, await this.writeRelationshipBatch(relationshipType, cypher, groupBatch, index));
+        }
+        logger.debug(`Finished saving ${relationships.length} unique relationships of type ${relationshipType}.`);
+        return counters;
+    }
+
+    /**
+     * Prepares and writes one batch of source groups in a managed write transaction.
+     * @param relationshipType - The relationship type of every row in the batch.
+     * @param cypher - The grouped MERGE query for that type.
+     * @param sourceGroups - Source groups to write.
+     * @param index - Batch index, for error reporting.
+     * @returns The batch's write counters.
+     */
+    private async writeRelationshipBatch(relationshipType: string, cypher: string, sourceGroups: SourceGroup[], index: number): Promise<WriteCounters> {
+        const groupBatch = this.prepareGroups(sourceGroups);
+        try {
+            const result = await this.neo4jClient.runTransaction<QueryResult>(cypher, { batch: groupBatch, type: relationshipType }, 'WRITE', 'StorageManager-Rels');
+            if (logger.isDebugEnabled()) {
+                const batchRelCount = groupBatch.reduce((sum, group) => sum + group.rels.length, 0);
+                logger.debug(`Saved batch ${index} of ${batchRelCount} ${relationshipType} relationships from ${groupBatch.length} sources`);
+            }
+            return result.summary.counters.updates();
+        } catch (error: any) {
+            logger.error(`Failed to save relationship batch (index ${index}, type: ${relationshipType})`, { error: error.message, code: error.code });
+             logger.error(`Failing relationship batch data (first 5 sources): ${JSON.stringify(groupBatch.slice(0, 5), null, 2)}`);
+            throw new Neo4jError(`Failed to save relationship batch (type ${relationshipType}): ${error.message}`, { originalError: error, code: error.code, context: { batch: groupBatch.slice(0,5) } });
+        }
+    }
+
+    /**
+     * Saves relationships of one type in a single auto-commit query using
+     * `CALL { ... } IN CONCURRENT TRANSACTIONS`, so each batch of rows is committed on its own server thread.
+     * Rows are grouped by source, so no two concurrent transactions write relationships from the same source node.
+     * Requires Neo4j 5.21+; callers must check `supportsConcurrentTransactions()` first.
+     * @param relationshipType - The specific type of relationships in this batch.
+     * @param relationships - The array of unique RelationshipInfo objects to save.
+     * @returns Write counters for the whole query.
+     */
+    private async saveRelationshipsConcurrently(relationshipType: string, relationships: RelationshipInfo[]): Promise<WriteCounters> {
+        // Send bounded chunks rather than every group of the type in one query, so a large type doesn't
+        // become one huge Bolt message and one huge server-side parameter list
+        const chunks = this.batchGroups(this.groupBySource(relationships), this.batchSize * this.concurrency);
+
+        const cypher = getConcurrentRelationshipMergeQuery(relationshipType, this.batchSize);
+
+        const counters: WriteCounters = {};
+        for (const [index, sourceChunk] of chunks.entries()) {
+            const chunk = this.prepareGroups(sourceChunk);
             try {
-                await this.neo4jClient.runTransaction(cypher, { batch: preparedBatch }, 'WRITE', 'StorageManager-Rels');
-                logger.debug(`Saved batch of ${preparedBatch.length} relationships (Total processed: ${Math.min(i + preparedBatch.length, relationships.length)}/${relationships.length})`);
+                const result = await this.neo4jClient.runAutoCommit<QueryResult>(cypher, { batch: chunk, type: relationshipType }, 'WRITE', 'StorageManager-Rels');
+                addCounters(counters, result.summary.counters.updates());
             } catch (error: any) {
-                logger.error(`Failed to save relationship batch (index ${i}, type: ${relationshipType})`, { error: error.message, code: error.code });
-                 logger.error(`Failing relationship batch data (first 5): ${JSON.stringify(preparedBatch.slice(0, 5), null, 2)}`);
-                throw new Neo4jError(`Failed to save relationship batch (type ${relationshipType}): ${error.message}`, { originalError: error, code: error.code, context: { batch: preparedBatch.slice(0,5) } });
+                logger.error(`Failed to save relationships concurrently (chunk ${index}, type: ${relationshipType})`, { error: error.message, code: error.code });
+                throw new Neo4jError(`Failed to save relationships concurrently (type ${relationshipType}): ${error.message}`, { originalError: error, code: error.code, context: { batch: chunk.slice(0, 5) } });
+            }
+        }
+        logger.debug(`Finished saving ${relationships.length} unique relationships of type ${relationshipType} (concurrent transactions, ${chunks.length} chunks).`);
+        return counters;
+    }
+
+    /**
+     * Groups relationships by source entityId, preserving first-seen order.
+     * Properties are prepared later, per batch (see prepareGroups), so only the batches in flight hold
+     * prepared copies instead of every relationship being duplicated before the first write.
+     * @param relationships - The relationships to group.
+     * @returns One entry per distinct source, carrying all of its relationships.
+     */
+    private groupBySource(relationships: RelationshipInfo[]): SourceGroup[] {
+        const groups = new Map<string, SourceGroup>();
+        for (const rel of relationships) {
+            let group = groups.get(rel.sourceId);
+            if (!group) {
+                group = { sourceId: rel.sourceId, rels: [] };
+                groups.set(rel.sourceId, group);
             }
+            group.rels.push(rel);
         }
-        logger.info(`Finished saving ${relationships.length} unique relationships of type ${relationshipType}.`);
+        return Array.from(groups.values());
+    }
+
+    /**
+     * Prepares the relationships of a batch of source groups for sending.
+     * @param groups - Source groups as returned by groupBySource/batchGroups.
+     */
+    private prepareGroups(groups: SourceGroup[]): RelationshipGroup[] {
+        return groups.map(group => ({
+            sourceId: group.sourceId,
+            rels: group.rels.map(rel => this.prepareRelationshipProperties(rel)),
+        }));
+    }
+
+    /**
+     * Splits source groups into batches of roughly `maxRelationships` relationships.
+     * A single group larger than the limit gets a batch of its own rather than being split.
+     * @param groups - Source groups as returned by groupBySource.
+     * @param maxRelationships - Target relationship count per batch (defaults to the transaction batch size).
+     */
+    private batchGroups(groups: SourceGroup[], maxRelationships: number = this.batchSize): SourceGroup[][] {
+        const batches: SourceGroup[][] = [];
+        let current: SourceGroup[] = [];
+        let currentSize = 0;
+        for (const group of groups) {
+            if (currentSize > 0 && currentSize + group.rels.length > maxRelationships) {
+                batches.push(current);
+                current = [];
+                currentSize = 0;
+            }
+            current.push(group);
+            currentSize += group.rels.length;
+        }
+        if (current.length > 0) {
+            batches.push(current);
+        }
+        return batches;
     }
 
     /**
      * Prepares AstNode properties for Neo4j storage.
      */
     private prepareNodeProperties(node: AstNode): Record<string, any> {
-        const { kind, id, entityId, properties: nestedProperties, ...baseProperties } = node;
-        const finalProperties: Record<string, any> = { ...baseProperties };
-         if (nestedProperties && typeof nestedProperties === 'object') {
-             Object.assign(finalProperties, nestedProperties);
-         }
-        Object.keys(finalProperties).forEach(key => {
-            if (finalProperties[key] === undefined) {
-                delete finalProperties[key];
+        // Single pass over the node: skip structural keys and undefined values instead of copying then deleting
+        const finalProperties: Record<string, any> = {};
+        const source = node as Record<string, any>;
+        for (const key in source) {
+            if (key === 'kind' || key === 'id' || key === 'entityId' || key === 'properties') {
+                continue;
             }
-        });
-        finalProperties.entityId = entityId; // Ensure entityId is part of the properties for SET
+            const value = source[key];
+            if (value !== undefined) {
+                finalProperties[key] = value;
+            }
+        }
+        const nestedProperties = node.properties;
+        if (nestedProperties && typeof nestedProperties === 'object') {
+            for (const key in nestedProperties) {
+                const value = nestedProperties[key];
+                if (value === undefined) {
+                    delete finalProperties[key]; // An undefined nested value still masks the base property
+                } else {
+                    finalProperties[key] = value;
+                }
+            }
+        }
+        finalProperties.entityId = node.entityId; // Ensure entityId is part of the properties for SET
         return finalProperties;
     }
 
 
     /**
      * Prepares RelationshipInfo properties for Neo4j storage.
+     * Rows only carry what the MERGE query reads: the source id lives on the enclosing group and the
+     * type is a single query parameter, so neither is repeated for every relationship.
+     * The properties map is passed through as is unless it holds undefined values, which are replaced by null
+     * in a copy; most relationships have none, so they are serialized without an intermediate copy.
      */
     private prepareRelationshipProperties(rel: RelationshipInfo): Record<string, any> {
-        const preparedProps = { ...rel.properties };
-         for (const key in preparedProps) {
-             if (preparedProps[key] === undefined) {
-                 preparedProps[key] = null; // Use null instead of deleting
-             }
-         }
+        const relProperties = rel.properties ?? EMPTY_PROPERTIES;
+        let preparedProps: Record<string, any> = relProperties;
+        for (const key in relProperties) {
+            if (relProperties[key] === undefined) {
+                preparedProps = {};
+                for (const copyKey in relProperties) {
+                    const value = relProperties[copyKey];
+                    preparedProps[copyKey] = value === undefined ? null : value; // Use null instead of deleting
+                }
+                break;
+            }
+        }
         return {
             entityId: rel.entityId,
-            sourceId: rel.sourceId,
             targetId: rel.targetId,
-            type: rel.type,
             weight: rel.weight ?? 0,
             createdAt: rel.createdAt,
             properties: preparedProps,
@@ -84,6 +84,7 @@ export interface ParserContext {
     sourceFile: SourceFile; // Use ts-morph SourceFile
     fileNode: FileNode; // Reference to the FileNode being processed
     result: SingleFileParseResult; // The accumulating result for the current file
+    nodesById: Map<string, AstNode>; // First node added per entityId in `result.nodes`, for O(1) lookups while parsing
     addNode: (node: AstNode) => void;
     addRelationship: (rel: RelationshipInfo) => void;
     generateId: (prefix: string, identifier: string, options?: { line?: number; column?: number }) => string;
@@ -110,6 +111,7 @@ export interface TargetDeclarationInfo {
  */
 export interface ResolverContext {
     nodeIndex: Map<string, AstNode>;
+    nodesByFilePath: Map<string, AstNode[]>; // Nodes of each file, in nodeIndex order (avoids scanning every node per file)
     addRelationship: (rel: RelationshipInfo) => void;
     generateId: (prefix: string, identifier: string, options?: { line?: number; column?: number }) => string;
     generateEntityId: (kind: string, qualifiedName: string) => string;
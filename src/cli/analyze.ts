@@ -62,32 +62,44 @@ export function registerAnalyzeCommand(program: Command): void {
                 logger.info('Neo4j connection established.');
 
                 // 2. Handle Schema and Reset Options
+                // Only storage depends on these steps, so they run on the server while files are scanned and parsed
                 const schemaManager = new SchemaManager(neo4jClient);
+                const databaseReady = (async () => {
+                    // Also open the storage writers' connections now rather than on the first write batches
+                    const poolWarmUp = neo4jClient.warmUpPool(config.storageConcurrency, 'Analyzer');
 
-                if (finalOptions.resetDb) {
-                    logger.warn('Resetting database: Deleting ALL nodes and relationships...');
-                    await schemaManager.resetDatabase();
-                    logger.info('Database reset complete.');
-                    // Schema will be applied next anyway
-                }
-
-                if (finalOptions.updateSchema || finalOptions.resetDb) {
-                    logger.info('Applying Neo4j schema (constraints and indexes)...');
-                    await schemaManager.applySchema(true); // Force update if requested or after reset
-                    logger.info('Schema application complete.');
-                } else {
-                     // Optionally apply schema if it doesn't exist, without forcing
-                     // await schemaManager.applySchema(false);
-                     logger.debug('Skipping schema update (use --update-schema to force).');
-                }
+                    if (finalOptions.resetDb) {
+                        logger.warn('Resetting database: Deleting ALL nodes and relationships...');
+                        await schemaManager.resetDatabase();
+                        logger.info('Database reset complete.');
+                        // Schema will be applied next anyway
+                    }
 
+                    if (finalOptions.updateSchema || finalOptions.resetDb) {
+                        logger.info('Applying Neo4j schema (constraints and indexes)...');
+                        await schemaManager.applySchema(true); // Force update if requested or after reset
+                        logger.info('Schema application complete.');
+                    } else {
+                         // Apply schema if it doesn't exist, without forcing: storage MERGEs rely on the entityId constraints
+                         await schemaManager.applySchema(false);
+                         logger.debug('Ensured schema exists (use --update-schema to force a rebuild).');
+                    }
+                    await poolWarmUp;
+                })();
+                databaseReady.catch(() => { /* Marked handled here; the failure is re-thrown where databaseReady is awaited */ });
 
                 // 3. Run Analysis
-                // AnalyzerService now creates its own Neo4jClient
-                const analyzerService = new AnalyzerService();
+                // Share the already-connected client (and its connection pool and CLI overrides) with the analyzer
+                const analyzerService = new AnalyzerService(neo4jClient);
                 logger.info(`Starting analysis of directory: ${absoluteDirPath}`);
-                // Use the simplified analyze method
-                await analyzerService.analyze(absoluteDirPath);
+                try {
+                    await analyzerService.analyze(absoluteDirPath, databaseReady);
+                } finally {
+                    // Never close the driver under a still-running reset/schema step (e.g. when parsing failed)
+                    await databaseReady.catch(() => { /* Reported below, unless the analysis error takes precedence */ });
+                }
+                // Surface schema failures even when the analysis stopped before storing anything
+                await databaseReady;
 
                 logger.info('Analysis command finished successfully.');
 
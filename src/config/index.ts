@@ -1,5 +1,6 @@
 import dotenv from 'dotenv';
 import path from 'path';
+import os from 'os';
 
 // Load environment variables from .env file
 dotenv.config({ path: path.resolve(process.cwd(), '.env') });
@@ -20,6 +21,24 @@ interface Config {
   neo4jDatabase: string;
   /** Batch size for writing nodes/relationships to Neo4j. */
   storageBatchSize: number;
+  /** Maximum number of storage batches/relationship types written to Neo4j concurrently. */
+  storageConcurrency: number;
+  /** Maximum number of files parsed by external/per-file parsers (e.g. Python subprocesses) at once. */
+  parserConcurrency: number;
+  /** Maximum number of Bolt connections the Neo4j driver keeps per host. */
+  neo4jMaxConnectionPoolSize: number;
+  /** Milliseconds to wait for a free pooled connection before failing. */
+  neo4jConnectionAcquisitionTimeout: number;
+  /** Milliseconds after which pooled connections are retired and replaced. */
+  neo4jMaxConnectionLifetime: number;
+  /** Milliseconds allowed for establishing a new Bolt connection. */
+  neo4jConnectionTimeout: number;
+  /** Milliseconds the driver keeps retrying a managed transaction on transient errors. */
+  neo4jMaxTransactionRetryTime: number;
+  /** Number of records pulled per Bolt PULL request when streaming results. */
+  neo4jFetchSize: number;
+  /** Whether the server should skip generating query notifications. Opt-in: servers before Neo4j 5.7 reject the filter. */
+  neo4jDisableNotifications: boolean;
   /** Directory to store temporary analysis files. */
   tempDir: string;
   /** Glob patterns for files/directories to ignore during scanning. */
@@ -28,6 +47,16 @@ interface Config {
   supportedExtensions: string[];
 }
 
+/**
+ * Parsing is CPU-bound (one subprocess per file for some languages), so scale with cores, capped at 32.
+ * availableParallelism() honours CPU affinity, so a pinned or containerised process doesn't oversubscribe
+ * its cores; os.cpus() can also be empty on some platforms.
+ */
+function defaultParserConcurrency(): number {
+  const cores = typeof os.availableParallelism === 'function' ? os.availableParallelism() : os.cpus().length;
+  return Math.min(32, Math.max(1, cores) + 4);
+}
+
 const config: Config = {
   logLevel: process.env.LOG_LEVEL || 'info',
   neo4jUrl: process.env.NEO4J_URL || 'bolt://localhost:7687',
@@ -35,6 +64,15 @@ const config: Config = {
   neo4jPassword: process.env.NEO4J_PASSWORD || 'password', // Replace with your default password
   neo4jDatabase: process.env.NEO4J_DATABASE || 'codegraph',
   storageBatchSize: parseInt(process.env.STORAGE_BATCH_SIZE || '100', 10),
+  storageConcurrency: parseInt(process.env.STORAGE_CONCURRENCY || '8', 10),
+  parserConcurrency: parseInt(process.env.PARSER_CONCURRENCY || String(defaultParserConcurrency()), 10),
+  neo4jMaxConnectionPoolSize: parseInt(process.env.NEO4J_POOL_SIZE || '100', 10),
+  neo4jConnectionAcquisitionTimeout: parseInt(process.env.NEO4J_CONNECTION_ACQUISITION_TIMEOUT || '60000', 10),
+  neo4jMaxConnectionLifetime: parseInt(process.env.NEO4J_MAX_CONNECTION_LIFETIME || '3600000', 10),
+  neo4jConnectionTimeout: parseInt(process.env.NEO4J_CONNECTION_TIMEOUT || '20000', 10),
+  neo4jMaxTransactionRetryTime: parseInt(process.env.NEO4J_MAX_TRANSACTION_RETRY_TIME || '15000', 10),
+  neo4jFetchSize: parseInt(process.env.NEO4J_FETCH_SIZE || '1000', 10),
+  neo4jDisableNotifications: process.env.NEO4J_DISABLE_NOTIFICATIONS === 'true',
   tempDir: path.resolve(process.cwd(), process.env.TEMP_DIR || './analysis-data/temp'),
   ignorePatterns: [
     '**/node_modules/**',
@@ -85,5 +123,39 @@ if (isNaN(config.storageBatchSize) || config.storageBatchSize <= 0) {
   console.warn(`Invalid STORAGE_BATCH_SIZE found, defaulting to 100. Value: ${process.env.STORAGE_BATCH_SIZE}`);
   config.storageBatchSize = 100;
 }
+if (isNaN(config.neo4jMaxConnectionPoolSize) || config.neo4jMaxConnectionPoolSize <= 0) {
+  console.warn(`Invalid NEO4J_POOL_SIZE found, defaulting to 100. Value: ${process.env.NEO4J_POOL_SIZE}`);
+  config.neo4jMaxConnectionPoolSize = 100;
+}
+if (isNaN(config.storageConcurrency) || config.storageConcurrency <= 0) {
+  console.warn(`Invalid STORAGE_CONCURRENCY found, defaulting to 8. Value: ${process.env.STORAGE_CONCURRENCY}`);
+  config.storageConcurrency = 8;
+}
+if (isNaN(config.parserConcurrency) || config.parserConcurrency <= 0) {
+  console.warn(`Invalid PARSER_CONCURRENCY found, defaulting to ${defaultParserConcurrency()}. Value: ${process.env.PARSER_CONCURRENCY}`);
+  config.parserConcurrency = defaultParserConcurrency();
+}
+// Leave headroom in the pool for schema/probe sessions opened alongside storage writes
+config.storageConcurrency = Math.max(1, Math.min(config.storageConcurrency, config.neo4jMaxConnectionPoolSize - 2));
+if (isNaN(config.neo4jConnectionAcquisitionTimeout) || config.neo4jConnectionAcquisitionTimeout <= 0) {
+  console.warn(`Invalid NEO4J_CONNECTION_ACQUISITION_TIMEOUT found, defaulting to 60000. Value: ${process.env.NEO4J_CONNECTION_ACQUISITION_TIMEOUT}`);
+  config.neo4jConnectionAcquisitionTimeout = 60000;
+}
+if (isNaN(config.neo4jMaxConnectionLifetime) || config.neo4jMaxConnectionLifetime <= 0) {
+  console.warn(`Invalid NEO4J_MAX_CONNECTION_LIFETIME found, defaulting to 3600000. Value: ${process.env.NEO4J_MAX_CONNECTION_LIFETIME}`);
+  config.neo4jMaxConnectionLifetime = 3600000;
+}
+if (isNaN(config.neo4jConnectionTimeout) || config.neo4jConnectionTimeout <= 0) {
+  console.warn(`Invalid NEO4J_CONNECTION_TIMEOUT found, defaulting to 20000. Value: ${process.env.NEO4J_CONNECTION_TIMEOUT}`);
+  config.neo4jConnectionTimeout = 20000;
+}
+if (isNaN(config.neo4jMaxTransactionRetryTime) || config.neo4jMaxTransactionRetryTime < 0) {
+  console.warn(`Invalid NEO4J_MAX_TRANSACTION_RETRY_TIME found, defaulting to 15000. Value: ${process.env.NEO4J_MAX_TRANSACTION_RETRY_TIME}`);
+  config.neo4jMaxTransactionRetryTime = 15000;
+}
+if (isNaN(config.neo4jFetchSize) || config.neo4jFetchSize === 0 || config.neo4jFetchSize < -1) {
+  console.warn(`Invalid NEO4J_FETCH_SIZE found, defaulting to 1000. Value: ${process.env.NEO4J_FETCH_SIZE}`);
+  config.neo4jFetchSize = 1000;
+}
 
 export default config;
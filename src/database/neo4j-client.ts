@@ -1,21 +1,27 @@
-import neo4j, { Driver, Session, Transaction, ManagedTransaction } from 'neo4j-driver';
+import neo4j, { Driver, Session, SessionConfig, ManagedTransaction, ServerInfo } from 'neo4j-driver';
 import config from '../config/index.js';
 import { createContextLogger } from '../utils/logger.js';
 import { Neo4jError } from '../utils/errors.js'; // Assuming errors.ts will be created
 
 const logger = createContextLogger('Neo4jClient');
 
+// First backoff delay for retried auto-commit queries (doubles per attempt, as in the driver's managed retries)
+const AUTO_COMMIT_INITIAL_RETRY_DELAY_MS = 1000;
+
 /**
  * Manages the connection and interaction with the Neo4j database.
  */
 export class Neo4jClient {
     private driver: Driver | null = null;
+    private driverInitialization: Promise<void> | null = null; // In-flight initialization, shared by concurrent callers
+    private serverVersion: { major: number; minor: number } | null = null; // Detected once at driver initialization
     private readonly neo4jConfig: {
         uri: string;
         username: string;
         password: string;
         database: string;
     };
+    private readonly sessionConfigs: Record<'READ' | 'WRITE', SessionConfig>; // Built once, shared by every session
 
     /**
      * Creates an instance of Neo4jClient.
@@ -29,6 +35,15 @@ export class Neo4jClient {
             password: configOverride?.password ?? config.neo4jPassword,
             database: configOverride?.database ?? config.neo4jDatabase,
         };
+        // Every session uses the same database and fetch size, so the per-mode configs are fixed up front
+        const baseSessionConfig = {
+            database: this.neo4jConfig.database,
+            fetchSize: config.neo4jFetchSize, // Stream large results in PULL batches instead of one unbounded pull
+        };
+        this.sessionConfigs = {
+            READ: { ...baseSessionConfig, defaultAccessMode: neo4j.session.READ },
+            WRITE: { ...baseSessionConfig, defaultAccessMode: neo4j.session.WRITE },
+        };
         logger.info('Neo4jClient instance created (driver not initialized).');
         logger.debug('Using Neo4j config:', {
             uri: this.neo4jConfig.uri, // Log URI
@@ -42,10 +57,15 @@ export class Neo4jClient {
     /**
      * Initializes the Neo4j driver instance if it hasn't been already.
      * Verifies connectivity to the database.
+     * Concurrent callers share a single in-flight initialization, so only one driver (and pool) is ever created.
      * @param context - Optional context string for logging (e.g., 'Analyzer', 'API').
      * @throws {Neo4jError} If connection fails.
      */
     public async initializeDriver(context: string = 'Default'): Promise<void> {
+        if (this.driverInitialization) {
+            logger.debug(`(${context}) Neo4j driver initialization already in progress, waiting for it.`);
+            return this.driverInitialization;
+        }
         if (this.driver) {
             logger.debug(`(${context}) Neo4j driver already initialized.`);
             // Optionally add a connectivity check here even if initialized
@@ -53,13 +73,33 @@ export class Neo4jClient {
             return;
         }
 
-        logger.info(`(${context}) Initializing Neo4j driver...`);
+        this.driverInitialization = this.createDriver(context).finally(() => {
+            this.driverInitialization = null;
+        });
+        return this.driverInitialization;
+    }
+
+    /**
+     * Creates the driver, verifies connectivity and detects the server version.
+     * Only called through initializeDriver, which guarantees a single concurrent invocation.
+     * @param context - Optional context string for logging.
+     * @throws {Neo4jError} If connection fails.
+     */
+    private async createDriver(context: string): Promise<void> {
+        logger.info(`(${context}) Initializing Neo4j driver (pool size: ${config.neo4jMaxConnectionPoolSize})...`);
         try {
             this.driver = neo4j.driver(
                 this.neo4jConfig.uri,
                 neo4j.auth.basic(this.neo4jConfig.username, this.neo4jConfig.password),
                 {
-                    // Configure driver options if needed (e.g., maxConnectionPoolSize)
+                    // Explicit pool/timeout settings instead of driver defaults (see config for env overrides)
+                    maxConnectionPoolSize: config.neo4jMaxConnectionPoolSize,
+                    connectionAcquisitionTimeout: config.neo4jConnectionAcquisitionTimeout,
+                    maxConnectionLifetime: config.neo4jMaxConnectionLifetime,
+                    connectionTimeout: config.neo4jConnectionTimeout,
+                    maxTransactionRetryTime: config.neo4jMaxTransactionRetryTime,
+                    // Nothing reads query notifications, so let Neo4j 5.7+ servers skip building them (opt-in, see config)
+                    ...(config.neo4jDisableNotifications && { notificationFilter: { minimumSeverityLevel: 'OFF' as const } }),
                     logging: {
                         level: config.logLevel === 'debug' ? 'debug' : 'info', // Map our log level
                         logger: (level, message) => logger.log(level, `(neo4j-driver) ${message}`),
@@ -67,7 +107,8 @@ export class Neo4jClient {
                 }
             );
             logger.info(`(${context}) Neo4j driver instance created.`);
-            await this.verifyConnectivity(context);
+            const serverInfo = await this.verifyConnectivity(context);
+            await this.detectServerVersion(serverInfo.agent, context);
             logger.info(`(${context}) Successfully connected to Neo4j database: ${this.neo4jConfig.database}`);
         } catch (error: any) {
             logger.error(`(${context}) Failed to initialize Neo4j driver or connect to database.`, {
@@ -75,7 +116,12 @@ export class Neo4jClient {
                 database: this.neo4jConfig.database,
                 error: error.message,
             });
+            // Release the half-initialized driver's pool rather than dropping the reference and leaving it open
+            const failedDriver = this.driver;
             this.driver = null; // Ensure driver is null on failure
+            if (failedDriver) {
+                await failedDriver.close().catch(() => { /* The connection error below is what matters */ });
+            }
             throw new Neo4jError(`Failed to connect to Neo4j: ${error.message}`, { originalError: error });
         }
     }
@@ -83,17 +129,19 @@ export class Neo4jClient {
     /**
      * Verifies the connection to the Neo4j database.
      * @param context - Optional context string for logging.
+     * @returns Server information reported during the handshake.
      * @throws {Neo4jError} If verification fails.
      */
-    private async verifyConnectivity(context: string): Promise<void> {
+    private async verifyConnectivity(context: string): Promise<ServerInfo> {
         if (!this.driver) {
             throw new Neo4jError('Driver not initialized. Cannot verify connectivity.');
         }
         logger.info(`(${context}) Verifying Neo4j connectivity to database: ${this.neo4jConfig.database}...`);
         try {
             // verifyConnectivity checks authentication and connectivity.
-            await this.driver.verifyConnectivity({ database: this.neo4jConfig.database });
+            const serverInfo = await this.driver.verifyConnectivity({ database: this.neo4jConfig.database });
             logger.debug(`(${context}) Neo4j connectivity verified successfully.`);
+            return serverInfo;
         } catch (error: any) {
             logger.error(`(${context}) Neo4j connectivity verification failed.`, {
                 database: this.neo4jConfig.database,
@@ -135,10 +183,7 @@ export class Neo4jClient {
     public async getSession(accessMode: 'READ' | 'WRITE' = 'WRITE', context: string = 'Default'): Promise<Session> {
         const driver = await this.getDriver(context); // Ensures driver is initialized
         try {
-            const session = driver.session({
-                database: this.neo4jConfig.database,
-                defaultAccessMode: accessMode === 'READ' ? neo4j.session.READ : neo4j.session.WRITE,
-            });
+            const session = driver.session(this.sessionConfigs[accessMode]);
             logger.debug(`(${context}) Neo4j session obtained for ${accessMode}.`);
             return session;
         } catch (error: any) {
@@ -147,6 +192,21 @@ export class Neo4jClient {
         }
     }
 
+    /**
+     * Closes a session obtained through getSession, logging (not throwing) close failures
+     * so they never mask the outcome of the query that used the session.
+     * @param session - The session to close.
+     * @param context - Optional context string for logging.
+     */
+    private async closeSession(session: Session, context: string): Promise<void> {
+        try {
+            await session.close();
+            logger.debug(`(${context}) Neo4j session closed.`);
+        } catch (closeError: any) {
+            logger.error(`(${context}) Failed to close Neo4j session.`, { error: closeError.message });
+        }
+    }
+
     /**
      * Executes a Cypher query within a managed transaction.
      * Handles session acquisition and closing automatically.
@@ -167,8 +227,11 @@ export class Neo4jClient {
         let session: Session | null = null;
         try {
             session = await this.getSession(accessMode, context);
-            const work = async (tx: ManagedTransaction): Promise<T> => {
+            if (logger.isDebugEnabled()) {
+                // Params can hold whole write batches; only serialize them when the line will actually be emitted
                 logger.debug(`(${context}) Running Cypher:\n${cypher}\nParams: ${JSON.stringify(params)}`);
+            }
+            const work = async (tx: ManagedTransaction): Promise<T> => {
                 const result = await tx.run(cypher, params);
                 // Often, you might want to process the result records here
                 // For simplicity, returning the raw result object for now
@@ -189,17 +252,167 @@ export class Neo4jClient {
             throw new Neo4jError(`Neo4j transaction failed: ${error.message}`, { originalError: error, code: error.code });
         } finally {
             if (session) {
+                await this.closeSession(session, context);
+            }
+        }
+    }
+
+
+    /**
+     * Executes a Cypher query in an auto-commit (implicit) transaction.
+     * Required for queries that manage their own transactions, such as
+     * `CALL { ... } IN [CONCURRENT] TRANSACTIONS`, which cannot run inside executeWrite/executeRead.
+     * The driver does not retry auto-commit transactions, so retriable failures (deadlocks, leader switches)
+     * are retried here with exponential backoff for up to `maxTransactionRetryTime`, mirroring executeWrite.
+     * Queries passed here must therefore be idempotent (e.g. MERGE-based).
+     *
+     * @param cypher - The Cypher query string.
+     * @param params - Optional parameters for the query.
+     * @param accessMode - 'READ' or 'WRITE'.
+     * @param context - Optional context string for logging.
+     * @returns The result of the query execution.
+     * @throws {Neo4jError} If the query fails.
+     */
+    public async runAutoCommit<T>(
+        cypher: string,
+        params: Record<string, any> = {},
+        accessMode: 'READ' | 'WRITE' = 'WRITE',
+        context: string = 'Default'
+    ): Promise<T> {
+        let session: Session | null = null;
+        try {
+            session = await this.getSession(accessMode, context);
+            logger.debug(`(${context}) Running auto-commit Cypher:\n${cypher}`);
+            const deadline = Date.now() + config.neo4jMaxTransactionRetryTime;
+            let delayMs = AUTO_COMMIT_INITIAL_RETRY_DELAY_MS;
+            for (;;) {
                 try {
-                    await session.close();
-                    logger.debug(`(${context}) Neo4j session closed.`);
-                } catch (closeError: any) {
-                    logger.error(`(${context}) Failed to close Neo4j session.`, { error: closeError.message });
-                    // Decide if this should throw or just be logged
+                    const result = await session.run(cypher, params);
+                    return result as T;
+                } catch (error: any) {
+                    if (!neo4j.isRetriableError(error) || Date.now() + delayMs > deadline) {
+                        throw error;
+                    }
+                    logger.warn(`(${context}) Retriable error in auto-commit query, retrying in ${delayMs}ms.`, { code: error.code });
+                    await new Promise(resolve => setTimeout(resolve, delayMs));
+                    delayMs *= 2;
                 }
             }
+        } catch (error: any) {
+            logger.error(`(${context}) Error executing Neo4j auto-commit query. Cypher: ${cypher.substring(0, 100)}...`, {
+                error: error.message,
+                code: error.code,
+            });
+            throw new Neo4jError(`Neo4j auto-commit query failed: ${error.message}`, { originalError: error, code: error.code });
+        } finally {
+            if (session) {
+                await this.closeSession(session, context);
+            }
+        }
+    }
+
+    /**
+     * Runs a sequence of operations on one session, closing it afterwards.
+     * For callers issuing many small dependent statements in a row (e.g. schema commands),
+     * which would otherwise set up and tear down a session per statement.
+     * Errors thrown by `work` are passed through unchanged, so callers can inspect driver error codes.
+     *
+     * @param accessMode - 'READ' or 'WRITE'.
+     * @param context - Optional context string for logging.
+     * @param work - Async function receiving the session.
+     * @returns The value returned by `work`.
+     * @throws {Neo4jError} If the session cannot be obtained.
+     */
+    public async withSession<T>(
+        accessMode: 'READ' | 'WRITE',
+        context: string,
+        work: (session: Session) => Promise<T>
+    ): Promise<T> {
+        const session = await this.getSession(accessMode, context);
+        try {
+            return await work(session);
+        } finally {
+            await this.closeSession(session, context);
         }
     }
 
+    /**
+     * Opens pooled connections ahead of a burst of concurrent work, so the burst doesn't pay connection setup
+     * (TCP/TLS, Bolt handshake, authentication) on its first queries. Each connection is exercised by a trivial
+     * query on its own session. Failures are only logged: the real work will surface connection problems.
+     * @param connections - Number of connections to open (capped at the pool size).
+     * @param context - Optional context string for logging.
+     */
+    public async warmUpPool(connections: number, context: string = 'Default'): Promise<void> {
+        const count = Math.min(connections, config.neo4jMaxConnectionPoolSize);
+        try {
+            const driver = await this.getDriver(context);
+            // The sessions run simultaneously, so each one holds (and therefore opens) a separate connection
+            await Promise.all(Array.from({ length: count }, async () => {
+                const session = driver.session(this.sessionConfigs.WRITE);
+                try {
+                    await session.run('RETURN 1');
+                } finally {
+                    await session.close();
+                }
+            }));
+            logger.debug(`(${context}) Warmed up ${count} Neo4j pool connections.`);
+        } catch (error: any) {
+            logger.warn(`(${context}) Could not warm up the Neo4j connection pool.`, { error: error.message });
+        }
+    }
+
+    /**
+     * Checks whether the connected server supports `CALL { ... } IN CONCURRENT TRANSACTIONS` (Neo4j 5.21+).
+     * @param context - Optional context string for logging.
+     * @returns True if concurrent transactions are available.
+     */
+    public async supportsConcurrentTransactions(context: string = 'Default'): Promise<boolean> {
+        return this.isServerVersionAtLeast(5, 21, context);
+    }
+
+    /**
+     * Compares the connected server version against a minimum version.
+     * The version is detected once when the driver is initialized, so this is normally a cached lookup.
+     * @param major - Minimum major version.
+     * @param minor - Minimum minor version.
+     * @param context - Optional context string for logging.
+     */
+    private async isServerVersionAtLeast(major: number, minor: number, context: string): Promise<boolean> {
+        if (this.driverInitialization) {
+            await this.driverInitialization; // The driver may already be set while the version is still being detected
+        }
+        if (!this.serverVersion) {
+            await this.getDriver(context); // Initializing the driver detects the server version
+        }
+        const version = this.serverVersion ?? { major: 0, minor: 0 };
+        return version.major > major || (version.major === major && version.minor >= minor);
+    }
+
+    /**
+     * Detects the server version once per driver, preferring the agent string from the connectivity
+     * handshake (e.g. "Neo4j/5.21.0") and only falling back to a `dbms.components()` query if it can't be parsed.
+     * Unknown versions are treated as 0.0, disabling all version-gated features.
+     * @param agent - Server agent string reported by verifyConnectivity.
+     * @param context - Optional context string for logging.
+     */
+    private async detectServerVersion(agent: string | undefined, context: string): Promise<void> {
+        let version = agent?.match(/^Neo4j\/(\d+\.\d+)/)?.[1];
+        if (!version) {
+            try {
+                const result: any = await this.runTransaction(
+                    "CALL dbms.components() YIELD name, versions WHERE name = 'Neo4j Kernel' RETURN versions[0] AS version",
+                    {}, 'READ', context
+                );
+                version = result.records?.[0]?.get('version');
+            } catch (error: any) {
+                logger.warn(`(${context}) Could not determine Neo4j server version, assuming an older server.`, { error: error.message });
+            }
+        }
+        const [serverMajor = 0, serverMinor = 0] = (version ?? '0.0').split('.').map((part: string) => parseInt(part, 10) || 0);
+        this.serverVersion = { major: serverMajor, minor: serverMinor };
+        logger.info(`(${context}) Detected Neo4j server version ${serverMajor}.${serverMinor}.`);
+    }
 
     /**
      * Closes the Neo4j driver connection if it's open.
@@ -211,6 +424,7 @@ export class Neo4jClient {
             try {
                 await this.driver.close();
                 this.driver = null;
+                this.serverVersion = null;
                 logger.info(`(${context}) Neo4j driver closed successfully.`);
             } catch (error: any) {
                 logger.error(`(${context}) Error closing Neo4j driver.`, { error: error.message });
@@ -20,6 +20,10 @@ export const NODE_LABELS = [
     'SQLSchema', 'SQLTable', 'SQLView', 'SQLColumn', 'SQLSelectStatement', 'SQLInsertStatement', 'SQLUpdateStatement', 'SQLDeleteStatement', 'SQLFunction', 'SQLProcedure'
 ];
 
+// Label added to every code entity node alongside its kind label, so entityId lookups that don't know the
+// kind (node MERGEs, relationship endpoints) go through a single uniqueness constraint instead of scanning all nodes
+export const BASE_NODE_LABEL = 'CodeNode';
+
 // Define Relationship Types used in the graph
 const BASE_RELATIONSHIP_TYPES = [
     'CONTAINS',      // Directory->File
@@ -70,12 +74,17 @@ const CROSS_FILE_RELATIONSHIP_TYPES = BASE_RELATIONSHIP_TYPES
 // --- Schema Definitions ---
 
 // Node Uniqueness Constraints (Crucial for merging nodes correctly)
+// The base label's constraint backs every node and endpoint MERGE, so it is created separately (see ensureBaseLabelConstraint)
+const BASE_LABEL_CONSTRAINT_NAME = `${BASE_NODE_LABEL.toLowerCase()}_entityid_unique`;
+const baseLabelConstraint =
+    `CREATE CONSTRAINT ${BASE_LABEL_CONSTRAINT_NAME} IF NOT EXISTS FOR (n:\`${BASE_NODE_LABEL}\`) REQUIRE n.entityId IS UNIQUE`;
 const nodeUniquenessConstraints = NODE_LABELS.map(label =>
     `CREATE CONSTRAINT ${label.toLowerCase()}_entityid_unique IF NOT EXISTS FOR (n:\`${label}\`) REQUIRE n.entityId IS UNIQUE`
 );
 
 // Indexes for faster lookups (Essential for performance)
 const indexes = [
+    `CREATE INDEX ${BASE_NODE_LABEL.toLowerCase()}_filepath_index IF NOT EXISTS FOR (n:${BASE_NODE_LABEL}) ON (n.filePath)`,
     ...NODE_LABELS.map(label => `CREATE INDEX ${label.toLowerCase()}_filepath_index IF NOT EXISTS FOR (n:${label}) ON (n.filePath)`),
     ...NODE_LABELS.map(label => `CREATE INDEX ${label.toLowerCase()}_name_index IF NOT EXISTS FOR (n:${label}) ON (n.name)`),
     `CREATE INDEX file_kind_index IF NOT EXISTS FOR (n:File) ON (n.kind)`, // Example
@@ -86,6 +95,7 @@ const indexes = [
  */
 export class SchemaManager {
     private neo4jClient: Neo4jClient;
+    private databaseCleared = false; // Set by resetDatabase: there is no existing data left to backfill
 
     constructor(neo4jClient: Neo4jClient) {
         this.neo4jClient = neo4jClient;
@@ -107,27 +117,34 @@ export class SchemaManager {
             ...indexes,
         ];
 
+        // Node writes (including concurrent-transaction MERGEs) rely on this constraint to stay unique,
+        // so unlike the other schema elements a failure to create it is fatal
+        await this.ensureBaseLabelConstraint();
+
         let appliedCount = 0;
         let failedCount = 0;
 
-        for (const command of allSchemaCommands) {
-            try {
-                await this.neo4jClient.runTransaction(command, {}, 'WRITE', 'SchemaManager');
-                logger.debug(`Successfully applied schema command: ${command.split(' ')[2]}...`);
-                appliedCount++;
-            } catch (error: any) {
-                const alreadyExists = error.code === 'Neo.ClientError.Schema.ConstraintAlreadyExists' ||
-                                      error.code === 'Neo.ClientError.Schema.IndexAlreadyExists' ||
-                                      error.message?.includes('already exists');
-
-                if (!alreadyExists || forceUpdate) {
-                    logger.error(`Failed to apply schema command: ${command}`, { code: error.code, message: error.message });
-                    failedCount++;
-                } else {
-                     logger.debug(`Schema element already exists, skipping: ${command.split(' ')[2]}...`);
+        // All commands run back to back on one session instead of opening a session per command
+        await this.neo4jClient.withSession('WRITE', 'SchemaManager', async (session) => {
+            for (const command of allSchemaCommands) {
+                try {
+                    await session.executeWrite(tx => tx.run(command));
+                    logger.debug(`Successfully applied schema command: ${command.split(' ')[2]}...`);
+                    appliedCount++;
+                } catch (error: any) {
+                    const alreadyExists = error.code === 'Neo.ClientError.Schema.ConstraintAlreadyExists' ||
+                                          error.code === 'Neo.ClientError.Schema.IndexAlreadyExists' ||
+                                          error.message?.includes('already exists');
+
+                    if (!alreadyExists || forceUpdate) {
+                        logger.error(`Failed to apply schema command: ${command}`, { code: error.code, message: error.message });
+                        failedCount++;
+                    } else {
+                         logger.debug(`Schema element already exists, skipping: ${command.split(' ')[2]}...`);
+                    }
                 }
             }
-        }
+        });
         logger.info(`Schema application finished. Applied/Verified: ${appliedCount}, Failed: ${failedCount}.`);
         if (failedCount > 0 && forceUpdate) {
              throw new Neo4jError(`Failed to apply ${failedCount} schema elements during forced update.`);
@@ -135,7 +152,67 @@ export class SchemaManager {
     }
 
     /**
-     * Drops all known user-defined constraints and indexes.
+     * Creates the BASE_NODE_LABEL entityId uniqueness constraint if it doesn't exist yet.
+     * Nodes written before the base label existed must carry it, or label-anchored MERGEs would duplicate them,
+     * so they are backfilled first. That full scan only runs while the constraint is missing (and not right after
+     * a reset, when there is nothing to backfill); if it fails, the constraint isn't created and the next run retries.
+     * Called by applySchema, and by AnalyzerService.analyze when no schema setup was passed in.
+     * @throws {Neo4jError} If the constraint can't be checked, backfilled or created.
+     */
+    async ensureBaseLabelConstraint(): Promise<void> {
+        try {
+            const existing: any = await this.neo4jClient.runTransaction(
+                'SHOW CONSTRAINTS YIELD name WHERE name = $name RETURN name',
+                { name: BASE_LABEL_CONSTRAINT_NAME }, 'READ', 'SchemaManager'
+            );
+            if (existing.records?.length > 0) {
+                logger.debug(`Schema element already exists, skipping: ${BASE_LABEL_CONSTRAINT_NAME}...`);
+                return;
+            }
+        } catch (error: any) {
+            logger.error(`Failed to check for constraint ${BASE_LABEL_CONSTRAINT_NAME}.`, { code: error.code, message: error.message });
+            throw new Neo4jError(`Failed to check for constraint ${BASE_LABEL_CONSTRAINT_NAME}: ${error.message}`, { originalError: error, code: error.code });
+        }
+
+        if (!this.databaseCleared) {
+            await this.backfillBaseLabel();
+        }
+
+        try {
+            await this.neo4jClient.runTransaction(baseLabelConstraint, {}, 'WRITE', 'SchemaManager');
+            logger.info(`Created constraint ${BASE_LABEL_CONSTRAINT_NAME}.`);
+        } catch (error: any) {
+            logger.error(`Failed to apply schema command: ${baseLabelConstraint}`, { code: error.code, message: error.message });
+            throw new Neo4jError(`Failed to create constraint ${BASE_LABEL_CONSTRAINT_NAME}: ${error.message}`, { originalError: error, code: error.code });
+        }
+    }
+
+    /**
+     * Adds BASE_NODE_LABEL to existing entity nodes that don't have it yet, in batched transactions.
+     * Only called while the base label's constraint is missing: on the first run against a database written before
+     * the constraint existed, or after the constraint was dropped outside this tool (dropAllSchemaElements keeps it).
+     */
+    private async backfillBaseLabel(): Promise<void> {
+        try {
+            const result: any = await this.neo4jClient.runAutoCommit(
+                `MATCH (n) WHERE n.entityId IS NOT NULL AND NOT n:${BASE_NODE_LABEL}
+                 CALL { WITH n SET n:${BASE_NODE_LABEL} } IN TRANSACTIONS OF 10000 ROWS`,
+                {}, 'WRITE', 'SchemaManager'
+            );
+            const labelsAdded = result.summary?.counters?.updates()?.labelsAdded ?? 0;
+            if (labelsAdded > 0) {
+                logger.info(`Added the ${BASE_NODE_LABEL} label to ${labelsAdded} existing nodes.`);
+            }
+        } catch (error: any) {
+            logger.error(`Failed to backfill the ${BASE_NODE_LABEL} label.`, { code: error.code, message: error.message });
+            throw new Neo4jError(`Failed to backfill the ${BASE_NODE_LABEL} label: ${error.message}`, { originalError: error, code: error.code });
+        }
+    }
+
+    /**
+     * Drops all known user-defined constraints and indexes, except the BASE_NODE_LABEL entityId constraint.
+     * That constraint (and its backing index) is kept so node MERGEs stay unique and a schema update doesn't
+     * trigger another base label backfill; ensureBaseLabelConstraint leaves it in place.
      * WARNING: Use with caution.
      */
     async dropAllSchemaElements(): Promise<void> {
@@ -149,7 +226,8 @@ export class SchemaManager {
                 'SHOW CONSTRAINTS YIELD name', {}, 'READ', 'SchemaManager'
             );
             // @ts-ignore TODO: Fix type casting from runTransaction
-            const constraintNames = constraintsResult.records?.map((r: any) => r.get('name')) || [];
+            const constraintNames = constraintsResult.records?.map((r: any) => r.get('name'))
+                .filter((name: string) => name !== BASE_LABEL_CONSTRAINT_NAME) || [];
             logger.debug(`Found ${constraintNames.length} existing constraints.`);
 
             for (const name of constraintNames) {
@@ -167,7 +245,8 @@ export class SchemaManager {
                 'SHOW INDEXES YIELD name', {}, 'READ', 'SchemaManager'
             );
              // @ts-ignore TODO: Fix type casting from runTransaction
-            const indexNames = indexesResult.records?.map((r: any) => r.get('name')).filter((name: string) => !name.includes('constraint')) || [];
+            const indexNames = indexesResult.records?.map((r: any) => r.get('name'))
+                .filter((name: string) => !name.includes('constraint') && name !== BASE_LABEL_CONSTRAINT_NAME) || [];
             logger.debug(`Found ${indexNames.length} existing user indexes.`);
 
             for (const name of indexNames) {
@@ -194,12 +273,17 @@ export class SchemaManager {
 
      /**
      * Deletes all nodes and relationships from the database.
+     * Deletes in batched transactions, so clearing a large graph doesn't build one huge transaction state.
      * WARNING: This is destructive and irreversible.
      */
     async resetDatabase(): Promise<void> {
         logger.warn('Deleting ALL nodes and relationships from the database...');
         try {
-            await this.neo4jClient.runTransaction('MATCH (n) DETACH DELETE n', {}, 'WRITE', 'SchemaManager');
+            await this.neo4jClient.runAutoCommit(
+                'MATCH (n) CALL { WITH n DETACH DELETE n } IN TRANSACTIONS OF 10000 ROWS',
+                {}, 'WRITE', 'SchemaManager'
+            );
+            this.databaseCleared = true;
             logger.info('All nodes and relationships deleted.');
         } catch (error: any) {
             logger.error('Failed to delete all data from the database.', { message: error.message });
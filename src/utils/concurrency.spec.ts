@@ -0,0 +1,41 @@
+import { describe, it, expect } from 'vitest';
+import { runWithConcurrency } from './concurrency.js';
+
+const delay = (ms: number) => new Promise(resolve => setTimeout(resolve, ms));
+
+describe('runWithConcurrency', () => {
+    it('should return results in input order', async () => {
+        const results = await runWithConcurrency([30, 10, 20], 3, async (ms, index) => {
+            await delay(ms);
+            return index;
+        });
+        expect(results).toEqual([0, 1, 2]);
+    });
+
+    it('should never exceed the concurrency limit', async () => {
+        let inFlight = 0;
+        let maxInFlight = 0;
+        await runWithConcurrency(Array.from({ length: 10 }, (_, i) => i), 3, async () => {
+            inFlight++;
+            maxInFlight = Math.max(maxInFlight, inFlight);
+            await delay(5);
+            inFlight--;
+        });
+        expect(maxInFlight).toBe(3);
+    });
+
+    it('should re-throw the first error and stop starting new items', async () => {
+        const started: number[] = [];
+        await expect(runWithConcurrency([0, 1, 2, 3, 4], 1, async (item) => {
+            started.push(item);
+            if (item === 1) {
+                throw new Error('boom');
+            }
+        })).rejects.toThrow('boom');
+        expect(started).toEqual([0, 1]);
+    });
+
+    it('should handle an empty list', async () => {
+        expect(await runWithConcurrency([], 4, async () => 1)).toEqual([]);
+    });
+});
@@ -0,0 +1,41 @@
+/**
+ * Runs an async worker over a list of items with at most `limit` workers in flight.
+ * Results are returned in input order. The first rejection is re-thrown once all started workers have settled,
+ * and no new items are started after a failure.
+ * @param items - The items to process.
+ * @param limit - Maximum number of concurrent workers (values below 1 are treated as 1).
+ * @param worker - Async function invoked for each item with its index.
+ * @returns The worker results, in the same order as `items`.
+ */
+export async function runWithConcurrency<T, R>(
+    items: T[],
+    limit: number,
+    worker: (item: T, index: number) => Promise<R>
+): Promise<R[]> {
+    const results: R[] = new Array(items.length);
+    let nextIndex = 0;
+    let firstError: unknown = null;
+    let failed = false;
+
+    const runNext = async (): Promise<void> => {
+        while (!failed && nextIndex < items.length) {
+            const index = nextIndex++;
+            try {
+                results[index] = await worker(items[index] as T, index);
+            } catch (error) {
+                if (!failed) {
+                    failed = true;
+                    firstError = error;
+                }
+            }
+        }
+    };
+
+    const workerCount = Math.min(Math.max(1, limit), items.length);
+    await Promise.all(Array.from({ length: workerCount }, () => runNext()));
+
+    if (failed) {
+        throw firstError;
+    }
+    return results;
+}
@@ -28,17 +28,15 @@ const consoleFormat = printf(({ level, message, timestamp, context, stack, ...me
   return log;
 });
 
-// Custom format for file logging
-const fileFormat = combine(
-  timestamp(),
-  errors({ stack: true }), // Log stack traces
-  json() // Log in JSON format
-);
+// Custom format for file logging.
+// The logger-level format has already stamped the entry and expanded error stacks, so only serialize here
+// (re-running timestamp()/errors() per file transport formatted every entry's time and stack once per file).
+const fileFormat = json(); // Log in JSON format
 
 const logger = winston.createLogger({
   level: config.logLevel || 'info', // Restore using config level
   format: combine(
-    timestamp({ format: 'YYYY-MM-DDTHH:mm:ss.SSSZ' }), // ISO 8601 format
+    timestamp({ format: () => new Date().toISOString() }), // ISO 8601 in UTC, as the file logs always used
     errors({ stack: true }) // Ensure errors format includes stack trace
   ),
   transports: [